@@ -0,0 +1,249 @@
+""" Play many simulated games in parallel to see how the difficulty settings work out. """
+
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+
+import Clock
+from Globals import TargetType, STRENGTH_INCREASE, VICTORY_POINTS
+from Simulation import Simulation
+from TargetFactory import formula_table
+
+# ===================================================================================
+
+class Typist:
+    """ Describe a simulated player: how fast they type, how often they err and how long they think. """
+
+    def __init__(self, name, keys_per_second, error_rate, reaction_time=400):
+        """ Set the values of the model. """
+        self.name = name
+        self.keys_per_second = keys_per_second
+        self.error_rate = error_rate
+        # milliseconds between finishing one code and starting the next
+        self.reaction_time = reaction_time
+
+    def __repr__(self):
+        return 'Typist({!r}, {}, {}, {})'.format(self.name, self.keys_per_second,
+                                                  self.error_rate, self.reaction_time)
+
+    def typing_time(self, value):
+        """ Return the milliseconds needed to think of the value, type it in and press enter. """
+        return self.reaction_time + (len(value) + 1) * 1000 / self.keys_per_second
+
+    @staticmethod
+    def parse(text):
+        """ Read a typist from 'name:keys_per_second:error_rate[:reaction_time]', or a preset name. """
+        if text in TYPISTS:
+            return TYPISTS[text]
+        name, *values = text.split(':')
+        if len(values) not in (2, 3):
+            raise ValueError('A typist is given as name:keys_per_second:error_rate[:reaction_time].')
+        return Typist(name, *map(float, values))
+
+TYPISTS = {'novice': Typist('novice', 2.5, 0.08, 700),
+           'average': Typist('average', 4, 0.04, 450),
+           'expert': Typist('expert', 7, 0.01, 250)}
+
+def parameter_set(strength_increase=STRENGTH_INCREASE, victory_points=VICTORY_POINTS,
+                  reward_scale=1, penalty_scale=1, time_scale=1):
+    """ Return a dictionary describing the difficulty settings of a game. """
+    return {'strength_increase': strength_increase,
+            'victory_points': victory_points,
+            'reward_scale': reward_scale,
+            'penalty_scale': penalty_scale,
+            'time_scale': time_scale}
+
+# ===================================================================================
+# a single game
+
+def play_game(parameters, typist, seed, tick=1000 / 60, max_length=30 * 60 * 1000):
+    """ Play one game with the settings and the typist; return a dictionary of its outcome. """
+    rng = random.Random(seed)
+    previous_clock = Clock.clock
+    clock = Clock.install(Clock.VirtualClock())
+    try:
+        simulation = Simulation(seed=rng.getrandbits(63),
+                                strength_increase=parameters['strength_increase'],
+                                victory_points=parameters['victory_points'],
+                                formulas=formula_table(parameters['reward_scale'],
+                                                       parameters['penalty_scale'],
+                                                       parameters['time_scale']))
+        simulation.start()
+        factory = simulation.factory
+
+        aim = None
+        ready_at = 0
+        while not simulation.finished and clock.now < max_length:
+            clock.advance(tick)
+            simulation.update()
+            if simulation.finished or clock.now < ready_at:
+                continue
+            if aim is not None:
+                # The code has been typed in - hit or miss.
+                if rng.random() < typist.error_rate:
+                    simulation.shoot(aim[:-1] + str((int(aim[-1]) + 1) % 10))
+                else:
+                    simulation.shoot(aim)
+                aim = None
+            # Go for the live Target with the least time left.
+            live = [target for target in factory.targets
+                    if target.exists(clock.now) and target.attributes.target_type == TargetType.TIMED]
+            if live:
+                target = min(live, key=lambda target: target.calculate_time_left())
+                aim = target.attributes.value
+                ready_at = clock.now + typist.typing_time(aim)
+    finally:
+        Clock.install(previous_clock)
+
+    keeper = simulation.score_keeper
+    return {'victory': bool(simulation.victory),
+            'finished': simulation.finished,
+            'score': simulation.score,
+            'length': clock.now,
+            'shot': keeper.targets_shot,
+            'misses': keeper.misses,
+            'timed_out': keeper.targets_timed_out}
+
+def play_job(job):
+    """ Play the game described by the job; return the job's key along with the outcome. """
+    key, parameters, typist, seed = job
+    return key, play_game(parameters, typist, seed)
+
+# ===================================================================================
+# aggregating the outcomes
+
+def percentile(sorted_values, fraction):
+    """ Return the value below which the given fraction of the sorted values lies. """
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def distribution(values):
+    """ Return the mean and the percentiles of the values. """
+    ordered = sorted(values)
+    return {'mean': sum(ordered) / len(ordered) if ordered else 0,
+            'p10': percentile(ordered, 0.1),
+            'p50': percentile(ordered, 0.5),
+            'p90': percentile(ordered, 0.9)}
+
+class Tally:
+    """ Collect the outcomes of the games of a single parameter set and typist. """
+
+    def __init__(self, parameters, typist):
+        """ Initialize the counters. """
+        self.parameters = parameters
+        self.typist = typist
+        self.games = 0
+        self.victories = 0
+        self.unfinished = 0
+        self.lengths = []
+        self.scores = []
+        self.accuracy = []
+
+    def add(self, outcome):
+        """ Count in the outcome of a game. """
+        self.games += 1
+        self.victories += outcome['victory']
+        self.unfinished += not outcome['finished']
+        self.lengths.append(outcome['length'] / 1000)
+        self.scores.append(outcome['score'])
+        attempts = outcome['shot'] + outcome['misses']
+        self.accuracy.append(outcome['shot'] / attempts if attempts else 0)
+
+    def summary(self):
+        """ Return a dictionary of the statistics gathered so far. """
+        return {'parameters': self.parameters,
+                'typist': self.typist.name,
+                'games': self.games,
+                'win_rate': self.victories / self.games if self.games else 0,
+                'unfinished': self.unfinished,
+                'length_seconds': distribution(self.lengths),
+                'score': distribution(self.scores),
+                'accuracy': distribution(self.accuracy)}
+
+# ===================================================================================
+# a sweep
+
+def sweep(parameter_sets, typists, games=100, processes=None, seed=0, report_every=None):
+    """
+    Play the games of every parameter set with every typist, yielding the summaries as they grow.
+
+    Every game has its own seed, derived from the sweep's seed, so a sweep can be repeated.
+    The games are spread over a pool of processes, one per core unless told otherwise;
+    a single process plays them all in this one. Stopping the iteration stops the pool.
+    """
+    tallies = {}
+    jobs = []
+    for set_index, parameters in enumerate(parameter_sets):
+        for typist in typists:
+            key = (set_index, typist.name)
+            tallies[key] = Tally(parameters, typist)
+            for game in range(games):
+                jobs.append((key, parameters, typist, '{}-{}-{}-{}'.format(seed, set_index, typist.name, game)))
+    total = len(jobs)
+    processes = processes or multiprocessing.cpu_count()
+    report_every = report_every or max(1, total // 20)
+
+    def report(done):
+        return {'done': done, 'total': total,
+                'results': [tally.summary() for tally in tallies.values()]}
+
+    if processes == 1:
+        outcomes = map(play_job, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes)
+        # Big enough chunks to keep the processes busy, small enough to report often.
+        chunksize = max(1, min(report_every, total // (processes * 8)))
+        outcomes = pool.imap_unordered(play_job, jobs, chunksize)
+    try:
+        done = 0
+        for key, outcome in outcomes:
+            tallies[key].add(outcome)
+            done += 1
+            if done % report_every == 0 and done < total:
+                yield report(done)
+        yield report(done)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+# ===================================================================================
+
+def main(argv=None):
+    """ Parse the command line and stream the summaries of a sweep as lines of JSON. """
+    parser = argparse.ArgumentParser(description='Balance the difficulty of num.type with simulated games.')
+    parser.add_argument('--games', type=int, default=100, help='games per parameter set and typist')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes; one per core by default')
+    parser.add_argument('--seed', type=int, default=0, help='seed the games are derived from')
+    parser.add_argument('--strength-increase', type=float, nargs='+', default=[STRENGTH_INCREASE])
+    parser.add_argument('--victory-points', type=int, nargs='+', default=[VICTORY_POINTS])
+    parser.add_argument('--reward-scale', type=float, nargs='+', default=[1])
+    parser.add_argument('--penalty-scale', type=float, nargs='+', default=[1])
+    parser.add_argument('--time-scale', type=float, nargs='+', default=[1])
+    parser.add_argument('--typist', nargs='+', default=['novice', 'average', 'expert'],
+                        help='preset name or name:keys_per_second:error_rate[:reaction_time]')
+    parser.add_argument('--report-every', type=int, default=None, help='games between partial reports')
+    args = parser.parse_args(argv)
+
+    parameter_sets = [parameter_set(*values) for values in
+                      itertools.product(args.strength_increase, args.victory_points,
+                                        args.reward_scale, args.penalty_scale, args.time_scale)]
+    typists = [Typist.parse(text) for text in args.typist]
+    began = time.perf_counter()
+    try:
+        for report in sweep(parameter_sets, typists, games=args.games, processes=args.processes,
+                            seed=args.seed, report_every=args.report_every):
+            report['elapsed_seconds'] = time.perf_counter() - began
+            print(json.dumps(report), flush=True)
+    except KeyboardInterrupt:
+        # The last partial report printed stands as the result.
+        sys.exit(130)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import unittest
+from Balancer import Typist, TYPISTS, parameter_set, play_game, sweep
+
+class TestBalancer(unittest.TestCase):
+
+    # =============================================================
+    # test a single game
+
+    def test_should_parse_typists(self):
+        self.assertIs(Typist.parse('expert'), TYPISTS['expert'])
+        typist = Typist.parse('slow:2:0.5')
+        self.assertEqual((typist.keys_per_second, typist.error_rate, typist.reaction_time), (2, 0.5, 400))
+        with self.assertRaises(ValueError):
+            Typist.parse('broken:2')
+
+    def test_should_repeat_game_of_seed(self):
+        first = play_game(parameter_set(), TYPISTS['average'], 'seed')
+        second = play_game(parameter_set(), TYPISTS['average'], 'seed')
+        self.assertEqual(first, second)
+        self.assertTrue(first['finished'])
+
+    def test_should_lose_when_never_hitting(self):
+        outcome = play_game(parameter_set(), Typist('clumsy', 10, 1, 0), 1)
+        self.assertFalse(outcome['victory'])
+        self.assertEqual(outcome['shot'], 0)
+        self.assertGreater(outcome['misses'], 0)
+
+    # =============================================================
+    # test sweeps
+
+    def test_should_stream_reports_of_sweep(self):
+        parameter_sets = [parameter_set(victory_points=500), parameter_set(victory_points=1000)]
+        reports = list(sweep(parameter_sets, [TYPISTS['expert']], games=4, processes=1, report_every=3))
+        self.assertEqual([report['done'] for report in reports], [3, 6, 8])
+        results = reports[-1]['results']
+        self.assertEqual([result['games'] for result in results], [4, 4])
+        self.assertEqual(results[0]['parameters']['victory_points'], 500)
+        self.assertEqual(results[0]['win_rate'], 1)
+
+    def test_should_give_same_results_in_pool(self):
+        parameter_sets = [parameter_set(victory_points=500)]
+        alone = list(sweep(parameter_sets, [TYPISTS['novice']], games=4, processes=1))[-1]
+        pooled = list(sweep(parameter_sets, [TYPISTS['novice']], games=4, processes=2))[-1]
+        self.assertEqual(alone['results'], pooled['results'])
+
+# #############################################################
+# SUITES
+
+def suite_game():
+    suite = unittest.TestSuite()
+    suite.addTest(TestBalancer('test_should_parse_typists'))
+    suite.addTest(TestBalancer('test_should_repeat_game_of_seed'))
+    suite.addTest(TestBalancer('test_should_lose_when_never_hitting'))
+    return suite
+
+def suite_sweep():
+    suite = unittest.TestSuite()
+    suite.addTest(TestBalancer('test_should_stream_reports_of_sweep'))
+    suite.addTest(TestBalancer('test_should_give_same_results_in_pool'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_game())
+    runner.run(suite_sweep())
@@ -0,0 +1,122 @@
+""" Measure the frame timings of the main screen without opening a window. """
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+
+# The dummy driver has to be chosen before pygame initializes the display.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# Keep the standard output clean for the JSON.
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from Globals import Attribute as AT
+from Globals import TargetType, STRENGTH_INCREASE
+from TargetModule import TargetBlueprint
+import Num
+
+PHASES = ('events', 'update', 'draw', 'frame')
+
+# ===================================================================================
+
+def percentile(sorted_values, fraction):
+    """ Return the value below which the given fraction of the sorted values lies. """
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+def summarize(samples):
+    """ Return the statistics of a list of timings, in milliseconds. """
+    ordered = sorted(samples)
+    return {'mean': sum(ordered) / len(ordered) * 1000 if ordered else 0,
+            'p50': percentile(ordered, 0.5) * 1000,
+            'p99': percentile(ordered, 0.99) * 1000,
+            'max': (ordered[-1] if ordered else 0) * 1000}
+
+def current_commit():
+    """ Return the hash of the checked-out commit, if there is one. """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ===================================================================================
+
+def run(targets=50, frames=600, dirty_rects=False, vectorized=False, seed=None):
+    """ Run the main screen with the given number of extra Targets and time each phase. """
+    random.seed(seed)
+    game = Num.Game(dirty_rects=dirty_rects, vectorized_targets=vectorized, seed=seed)
+    game.begin_game()
+    screen = game.current_screen
+    # Keep the board populated no matter the score.
+    screen.simulation.check_end = lambda: None
+
+    for i in range(targets):
+        blueprint = TargetBlueprint()
+        blueprint.attributes[AT.TARGET_TYPE] = TargetType.TIMED
+        blueprint.attributes[AT.STRENGTH] = 3 - STRENGTH_INCREASE
+        screen.target_factory.create(blueprint)
+
+    samples = {phase: [] for phase in PHASES}
+    clock = time.perf_counter
+    for frame in range(frames):
+        began = clock()
+        game.clock.tick()
+        screen.events()
+        events_done = clock()
+        screen.update()
+        update_done = clock()
+        screen.draw()
+        draw_done = clock()
+        samples['events'].append(events_done - began)
+        samples['update'].append(update_done - events_done)
+        samples['draw'].append(draw_done - update_done)
+        samples['frame'].append(draw_done - began)
+
+    result = {'commit': current_commit(),
+              'python': sys.version.split()[0],
+              'pygame': pygame.version.ver,
+              'targets': targets,
+              'targets_alive': len(screen.target_factory.targets),
+              'frames': frames,
+              'dirty_rects': dirty_rects,
+              'vectorized': vectorized,
+              'seed': seed,
+              'pool': screen.target_factory.pool_stats(),
+              'timings_ms': {phase: summarize(samples[phase]) for phase in PHASES}}
+    pygame.quit()
+    return result
+
+# ===================================================================================
+
+def main(argv=None):
+    """ Parse the command line, run the benchmark and print the results as JSON. """
+    parser = argparse.ArgumentParser(description='Benchmark num.type frame timings headlessly.')
+    parser.add_argument('--targets', type=int, default=50, help='number of extra Targets to spawn')
+    parser.add_argument('--frames', type=int, default=600, help='number of frames to run')
+    parser.add_argument('--dirty-rects', action='store_true', help='redraw only the changed areas')
+    parser.add_argument('--vectorized', action='store_true', help='process the timers in NumPy columns')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the random generator')
+    parser.add_argument('--output', default=None, help='file to write the JSON to instead of stdout')
+    args = parser.parse_args(argv)
+
+    result = run(targets=args.targets, frames=args.frames,
+                 dirty_rects=args.dirty_rects, vectorized=args.vectorized, seed=args.seed)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
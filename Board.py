@@ -0,0 +1,101 @@
+""" Provide a scrollable board of Target rows which only shows the rows inside its viewport. """
+
+from Globals import Attribute as AT
+from Globals import OrderedSet
+
+class Board:
+    """
+    Lay the Targets out in rows and keep track of which of them can be seen.
+
+    The Targets outside of the viewport keep playing, but they are not shown, so they cost
+    nothing to draw. The visible Targets are tracked as they come and go, and scrolling
+    only visits the rows entering and leaving the viewport.
+    """
+
+    def __init__(self, x, top, row_height, height=None):
+        """ Initialize the layout; without a height, the board never ends and shows everything. """
+        self.x = x
+        self.top = top
+        self.row_height = row_height
+        # number of rows fitting in the viewport, or None if all of them do
+        self.page = None if height is None else max(1, int(height // row_height))
+        # index of the topmost row shown
+        self.scroll = 0
+        # Targets by their rows
+        self.rows = {}
+        self.visible = OrderedSet()
+
+    def __len__(self):
+        return sum(len(targets) for targets in self.rows.values())
+
+    def is_row_visible(self, row):
+        """ Check whether the row lies inside the viewport. """
+        return self.page is None or self.scroll <= row < self.scroll + self.page
+
+    def place(self, target):
+        """ Put the Target in its row; return whether it can be seen. """
+        row = target.attributes.position
+        self.rows.setdefault(row, OrderedSet()).add(target)
+        self.move(target, row)
+        if self.is_row_visible(row):
+            self.visible.add(target)
+            return True
+        return False
+
+    def remove(self, target):
+        """ Take the Target off the board; return whether it could be seen. """
+        row = target.attributes.position
+        targets = self.rows.get(row)
+        if targets is not None:
+            targets.discard(target)
+            if not targets:
+                del self.rows[row]
+        visible = target in self.visible
+        self.visible.discard(target)
+        return visible
+
+    def move(self, target, row):
+        """ Set the position of the Target on the screen, based on its row and the scroll. """
+        if target.store is not None:
+            # The column store calculates the positions of all its Targets before they are drawn.
+            return
+        target.set_position(x=self.x, y=self.top + (row - self.scroll) * self.row_height)
+
+    # =============================================================
+    # scrolling
+
+    def last_scroll(self):
+        """ Return the scroll at which the last occupied row is at the bottom of the viewport. """
+        if self.page is None or not self.rows:
+            return 0
+        return max(0, max(self.rows) - self.page + 1)
+
+    def scroll_to(self, scroll):
+        """ Show the rows from the given one on; return the Targets shown and hidden by that. """
+        scroll = min(max(0, scroll), self.last_scroll())
+        if self.page is None or scroll == self.scroll:
+            return [], []
+        old = range(self.scroll, self.scroll + self.page)
+        self.scroll = scroll
+        new = range(scroll, scroll + self.page)
+
+        hidden = []
+        for row in old:
+            if row not in new:
+                for target in self.rows.get(row, ()):
+                    self.visible.discard(target)
+                    hidden.append(target)
+        shown = []
+        for row in new:
+            targets = self.rows.get(row, ())
+            entering = row not in old
+            for target in targets:
+                self.move(target, row)
+                if entering:
+                    self.visible.add(target)
+                    shown.append(target)
+        return shown, hidden
+
+    def scroll_by(self, rows):
+        """ Scroll by the given number of rows; return the Targets shown and hidden by that. """
+        return self.scroll_to(self.scroll + rows)
@@ -0,0 +1,88 @@
+import unittest
+from Globals import Attribute as AT
+from Globals import Attributes
+from Board import Board
+
+class FakeTarget:
+    """ Stand in for a Target, remembering its position on the screen. """
+
+    def __init__(self, row):
+        self.attributes = Attributes({AT.POSITION: row})
+        self.x = self.y = self.store = None
+
+    def set_position(self, x, y):
+        self.x, self.y = x, y
+
+def create_board(rows=10):
+    board = Board(x=5, top=100, row_height=50, height=180)
+    targets = [FakeTarget(row) for row in range(rows)]
+    for target in targets:
+        board.place(target)
+    return board, targets
+
+class TestBoard(unittest.TestCase):
+
+    # =============================================================
+    # test placing
+
+    def test_should_show_only_rows_in_viewport(self):
+        board, targets = create_board()
+        self.assertEqual(board.page, 3)
+        self.assertEqual(list(board.visible), targets[:3])
+        self.assertEqual((targets[2].x, targets[2].y), (5, 200))
+        self.assertEqual(len(board), 10)
+
+    def test_should_show_everything_without_height(self):
+        board = Board(x=0, top=0, row_height=50)
+        self.assertTrue(board.place(FakeTarget(100)))
+        self.assertEqual(board.scroll_by(5), ([], []))
+
+    def test_should_forget_removed_target(self):
+        board, targets = create_board()
+        self.assertTrue(board.remove(targets[1]))
+        self.assertFalse(board.remove(targets[5]))
+        self.assertNotIn(targets[1], board.visible)
+        self.assertEqual(len(board), 8)
+
+    # =============================================================
+    # test scrolling
+
+    def test_should_report_shown_and_hidden_targets(self):
+        board, targets = create_board()
+        shown, hidden = board.scroll_by(2)
+        self.assertEqual(shown, targets[3:5])
+        self.assertEqual(hidden, targets[:2])
+        self.assertEqual(list(board.visible), [targets[2]] + targets[3:5])
+        self.assertEqual(targets[2].y, 100)
+
+    def test_should_clamp_scrolling_to_occupied_rows(self):
+        board, targets = create_board()
+        board.scroll_to(100)
+        self.assertEqual(board.scroll, 7)
+        board.scroll_by(-100)
+        self.assertEqual(board.scroll, 0)
+        self.assertEqual(list(board.visible), targets[:3])
+
+# #############################################################
+# SUITES
+
+def suite_placing():
+    suite = unittest.TestSuite()
+    suite.addTest(TestBoard('test_should_show_only_rows_in_viewport'))
+    suite.addTest(TestBoard('test_should_show_everything_without_height'))
+    suite.addTest(TestBoard('test_should_forget_removed_target'))
+    return suite
+
+def suite_scrolling():
+    suite = unittest.TestSuite()
+    suite.addTest(TestBoard('test_should_report_shown_and_hidden_targets'))
+    suite.addTest(TestBoard('test_should_clamp_scrolling_to_occupied_rows'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_placing())
+    runner.run(suite_scrolling())
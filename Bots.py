@@ -0,0 +1,195 @@
+""" Play the main screen with scripted typists pressing keys, to soak-test the game for hours. """
+
+import os
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from collections import deque
+
+# The dummy driver has to be chosen before pygame initializes the display.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# Keep the standard output clean for the JSON.
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+from pygame.locals import KEYDOWN, KEYUP
+
+import Clock
+from Globals import TargetType
+from Balancer import Typist, percentile
+import Num
+
+# the keypad codes the main screen listens to
+DIGIT_KEYS = {str(digit): 256 + digit for digit in range(10)}
+ENTER_KEY = 271
+BACKSPACE_KEY = 8
+
+# ===================================================================================
+
+class Bot:
+    """
+    Read the Targets on the screen and type their codes in with synthetic key events.
+
+    The keystrokes are planned ahead with their times and posted to pygame's event queue
+    once they are due, so the screen processes them exactly like those of a person.
+    A mistyped digit is noticed and corrected with backspace at the given rate;
+    otherwise the wrong code is sent and counts as a miss.
+    """
+
+    def __init__(self, screen, typist, correction_rate=0.5, seed=None):
+        """ Attach the bot to the screen. """
+        self.typist = typist
+        self.correction_rate = correction_rate
+        self.random = random.Random(seed)
+        # planned keystrokes: (time, event type, key)
+        self.pending = deque()
+        self.keys_posted = 0
+        self.attach(screen)
+
+    def attach(self, screen):
+        """ Start playing on another screen, forgetting the keystrokes planned for the old one. """
+        self.screen = screen
+        self.pending.clear()
+        self.ready_at = 0
+
+    def press(self, at, key):
+        """ Plan a single keystroke; return the time the next one can begin. """
+        interval = 1000 / self.typist.keys_per_second
+        self.pending.append((at, KEYDOWN, key))
+        self.pending.append((at + interval / 2, KEYUP, key))
+        return at + interval
+
+    def plan(self, now):
+        """ Choose a visible Target and plan typing its code in, with the mistakes of the typist. """
+        visible = [target for target in self.screen.target_factory.board.visible
+                   if target.exists(now) and target.attributes.target_type == TargetType.TIMED]
+        if not visible:
+            return False
+        target = min(visible, key=lambda target: target.calculate_time_left())
+        at = now + self.typist.reaction_time
+        for digit in target.attributes.value:
+            if self.random.random() < self.typist.error_rate:
+                wrong = str((int(digit) + self.random.randint(1, 9)) % 10)
+                at = self.press(at, DIGIT_KEYS[wrong])
+                if self.random.random() >= self.correction_rate:
+                    continue
+                at = self.press(at, BACKSPACE_KEY)
+            at = self.press(at, DIGIT_KEYS[digit])
+        self.ready_at = self.press(at, ENTER_KEY)
+        return True
+
+    def act(self, now):
+        """ Post the keystrokes due by now, planning new ones when the previous code is done. """
+        if not self.pending and now >= self.ready_at:
+            self.plan(now)
+        pending = self.pending
+        while pending and pending[0][0] <= now:
+            at, event_type, key = pending.popleft()
+            pygame.event.post(pygame.event.Event(event_type, key=key))
+            self.keys_posted += 1
+
+# ===================================================================================
+
+def memory_in_use():
+    """ Return the resident memory of the process in megabytes, or the peak if it is unknown. """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def soak(typist, minutes=60, fps=60, correction_rate=0.5, endless=False, dirty_rects=False,
+         report_every=60, trace=False, seed=None):
+    """
+    Let a bot play for the given number of game minutes, as fast as possible.
+
+    Every report_every seconds of game time, yield the frame timings of that stretch along with
+    the memory in use, so that growth and drift show up. With endless, the score never ends
+    the game; otherwise a new game begins whenever one ends.
+    """
+    clock = Clock.VirtualClock()
+    game = Num.Game(dirty_rects=dirty_rects, seed=seed, clock=clock)
+    bot = Bot(None, typist, correction_rate, seed)
+    if trace:
+        tracemalloc.start()
+
+    def begin():
+        game.begin_game()
+        if endless:
+            game.current_screen.simulation.check_end = lambda: None
+        bot.attach(game.current_screen)
+
+    begin()
+    games = 1
+    frame_length = 1000 / fps
+    frames_per_report = max(1, int(report_every * fps))
+    total_frames = int(minutes * 60 * fps)
+    timings = []
+    began = time.perf_counter()
+    for frame in range(1, total_frames + 1):
+        frame_began = time.perf_counter()
+        clock.advance(frame_length)
+        bot.act(clock.now)
+        screen = game.current_screen
+        screen.events()
+        screen.update()
+        screen.draw()
+        screen.idle()
+        timings.append(time.perf_counter() - frame_began)
+        if game.current_screen is not screen:
+            begin()
+            games += 1
+
+        if frame % frames_per_report == 0 or frame == total_frames:
+            timings.sort()
+            factory = game.current_screen.target_factory
+            report = {'game_minutes': clock.now / 60000,
+                      'wall_seconds': time.perf_counter() - began,
+                      'games': games,
+                      'keys_posted': bot.keys_posted,
+                      'frame_ms': {'mean': sum(timings) / len(timings) * 1000,
+                                   'p50': percentile(timings, 0.5) * 1000,
+                                   'p99': percentile(timings, 0.99) * 1000,
+                                   'max': timings[-1] * 1000},
+                      'memory_mb': memory_in_use(),
+                      'targets': len(factory.targets),
+                      'gui': len(game.current_screen.gui),
+                      'pool': factory.pool_stats()}
+            if trace:
+                report['traced_mb'] = tracemalloc.get_traced_memory()[0] / 2 ** 20
+            timings = []
+            yield report
+    if trace:
+        tracemalloc.stop()
+    pygame.quit()
+
+# ===================================================================================
+
+def main(argv=None):
+    """ Parse the command line and print the soak reports as lines of JSON. """
+    parser = argparse.ArgumentParser(description='Soak-test num.type with a scripted typist.')
+    parser.add_argument('--typist', default='expert',
+                        help='preset name or name:keys_per_second:error_rate[:reaction_time]')
+    parser.add_argument('--minutes', type=float, default=60, help='game minutes to play')
+    parser.add_argument('--fps', type=int, default=60, help='frames per game second')
+    parser.add_argument('--correction-rate', type=float, default=0.5,
+                        help='chance of a mistyped digit being corrected')
+    parser.add_argument('--endless', action='store_true', help='never let the score end the game')
+    parser.add_argument('--dirty-rects', action='store_true', help='redraw only the changed areas')
+    parser.add_argument('--report-every', type=float, default=60, help='game seconds between reports')
+    parser.add_argument('--trace', action='store_true', help='also report the memory traced by tracemalloc')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the game and the bot')
+    args = parser.parse_args(argv)
+
+    for report in soak(Typist.parse(args.typist), minutes=args.minutes, fps=args.fps,
+                       correction_rate=args.correction_rate, endless=args.endless,
+                       dirty_rects=args.dirty_rects, report_every=args.report_every,
+                       trace=args.trace, seed=args.seed):
+        print(json.dumps(report), flush=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import unittest
+import Clock
+import Num
+from Balancer import Typist, TYPISTS
+from Bots import Bot, soak
+
+class TestBots(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = Clock.clock
+
+    def tearDown(self):
+        Clock.install(self.previous_clock)
+
+    def play(self, typist, correction_rate, frames=600):
+        clock = Clock.VirtualClock()
+        game = Num.Game(seed=3, clock=clock)
+        game.begin_game()
+        screen = game.current_screen
+        bot = Bot(screen, typist, correction_rate, seed=3)
+        for frame in range(frames):
+            clock.advance(1000 / 60)
+            bot.act(clock.now)
+            screen.events()
+            screen.update()
+            if game.current_screen is not screen:
+                break
+        return bot, screen.simulation.score_keeper
+
+    # =============================================================
+    # test the bot
+
+    def test_should_shoot_targets_without_errors(self):
+        bot, keeper = self.play(Typist('machine', 1000, 0, 0), 0)
+        self.assertGreater(keeper.targets_shot, 0)
+        self.assertEqual(keeper.misses, 0)
+        self.assertGreater(bot.keys_posted, 0)
+
+    def test_should_correct_errors(self):
+        bot, keeper = self.play(Typist('sloppy', 1000, 0.5, 0), 1)
+        self.assertGreater(keeper.targets_shot, 0)
+        self.assertEqual(keeper.misses, 0)
+
+    def test_should_miss_uncorrected_errors(self):
+        bot, keeper = self.play(Typist('clumsy', 1000, 1, 0), 0)
+        self.assertEqual(keeper.targets_shot, 0)
+        self.assertGreater(keeper.misses, 0)
+
+    # =============================================================
+    # test soak runs
+
+    def test_should_report_soak_run(self):
+        reports = list(soak(TYPISTS['expert'], minutes=0.5, report_every=10, seed=1))
+        self.assertEqual([round(report['game_minutes'], 3) for report in reports], [0.167, 0.333, 0.5])
+        last = reports[-1]
+        self.assertGreater(last['keys_posted'], 0)
+        self.assertGreaterEqual(last['frame_ms']['max'], last['frame_ms']['p50'])
+        self.assertGreater(last['memory_mb'], 0)
+
+# #############################################################
+# SUITES
+
+def suite_bot():
+    suite = unittest.TestSuite()
+    suite.addTest(TestBots('test_should_shoot_targets_without_errors'))
+    suite.addTest(TestBots('test_should_correct_errors'))
+    suite.addTest(TestBots('test_should_miss_uncorrected_errors'))
+    return suite
+
+def suite_soak():
+    suite = unittest.TestSuite()
+    suite.addTest(TestBots('test_should_report_soak_run'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_bot())
+    runner.run(suite_soak())
@@ -0,0 +1,68 @@
+""" Provide the game time: one reading per tick, shared by everybody and replaceable. """
+
+class GameClock:
+    """
+    Follow a source of milliseconds and take a snapshot of it on every tick.
+
+    Everything that happens within a tick sees the same time. The time can be scaled,
+    which slows the game down or speeds it up, and moved forward at once.
+    """
+
+    def __init__(self, source=None, scale=1.0):
+        """ Start following the source; pygame's ticks are followed by default. """
+        if source is None:
+            import pygame
+            source = pygame.time.get_ticks
+        self.source = source
+        self.scale = scale
+        # the game time and the source time at which the scale last changed
+        self.base = self.origin = self.source()
+        self.now = int(self.base)
+
+    def read(self):
+        """ Return the current game time, without taking a snapshot. """
+        return self.base + (self.source() - self.origin) * self.scale
+
+    def tick(self):
+        """ Take a snapshot of the game time and return it. """
+        self.now = int(self.read())
+        return self.now
+
+    def set_scale(self, scale):
+        """ Make the game time pass the given number of times faster than the source's. """
+        if scale < 0:
+            raise ValueError('The time cannot flow backwards.')
+        self.base = self.read()
+        self.origin = self.source()
+        self.scale = scale
+
+    def fast_forward(self, milliseconds):
+        """ Move the game time forward at once. """
+        self.base += milliseconds
+        self.now = int(self.now + milliseconds)
+
+class VirtualClock(GameClock):
+    """ Count the time only when told to, for running the game without waiting for real time. """
+
+    def __init__(self, start=0, scale=1.0):
+        """ Start the time at the given millisecond. """
+        self.virtual_now = start
+        super().__init__(source=lambda: self.virtual_now, scale=scale)
+
+    def advance(self, milliseconds):
+        """ Let the given number of milliseconds pass and take a snapshot; return the game time. """
+        self.virtual_now += milliseconds
+        return self.tick()
+
+# The clock read by the game; replace it with install(). It stands still until then.
+clock = VirtualClock()
+
+def install(new_clock):
+    """ Make the game read the time from the given clock. """
+    global clock
+    clock = new_clock
+    return new_clock
+
+def get_ticks():
+    """ Return the game time of the current tick, in milliseconds. """
+    return clock.now
@@ -0,0 +1,69 @@
+import unittest
+import Clock
+from Clock import GameClock, VirtualClock
+
+class TestClock(unittest.TestCase):
+
+    # =============================================================
+    # test snapshots
+
+    def test_should_keep_time_until_tick(self):
+        source = [1000]
+        clock = GameClock(source=lambda: source[0])
+        source[0] = 1500
+        self.assertEqual(clock.now, 1000)
+        self.assertEqual(clock.tick(), 1500)
+        self.assertEqual(clock.now, 1500)
+
+    def test_should_serve_time_of_installed_clock(self):
+        previous = Clock.clock
+        try:
+            clock = Clock.install(VirtualClock(start=200))
+            self.assertEqual(Clock.get_ticks(), 200)
+            clock.advance(50)
+            self.assertEqual(Clock.get_ticks(), 250)
+        finally:
+            Clock.install(previous)
+
+    # =============================================================
+    # test changing the pace
+
+    def test_should_scale_time_without_jumping(self):
+        clock = VirtualClock()
+        clock.advance(100)
+        clock.set_scale(10)
+        self.assertEqual(clock.tick(), 100)
+        self.assertEqual(clock.advance(5), 150)
+        clock.set_scale(0)
+        self.assertEqual(clock.advance(1000), 150)
+        with self.assertRaises(ValueError):
+            clock.set_scale(-1)
+
+    def test_should_fast_forward(self):
+        clock = VirtualClock()
+        clock.fast_forward(60000)
+        self.assertEqual(clock.now, 60000)
+        self.assertEqual(clock.advance(1), 60001)
+
+# #############################################################
+# SUITES
+
+def suite_snapshots():
+    suite = unittest.TestSuite()
+    suite.addTest(TestClock('test_should_keep_time_until_tick'))
+    suite.addTest(TestClock('test_should_serve_time_of_installed_clock'))
+    return suite
+
+def suite_pace():
+    suite = unittest.TestSuite()
+    suite.addTest(TestClock('test_should_scale_time_without_jumping'))
+    suite.addTest(TestClock('test_should_fast_forward'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_snapshots())
+    runner.run(suite_pace())
@@ -0,0 +1,104 @@
+""" Provide the codes of the Targets, making sure no two live Targets share one. """
+
+def code_space(length):
+    """ Return the lowest code of the given length and the first number past the highest one. """
+    return (10 ** length) // 9, 10 ** length
+
+class CodeAllocator:
+    """
+    Reserve the codes of the live Targets and hand out only the free ones.
+
+    While a length has plenty of free codes, random ones are drawn until a free one comes up;
+    with at least half of them free, that takes fewer than two draws on average.
+    Once half of its codes are taken, the free codes are kept in a shuffled list instead,
+    so that a free code is always a single pop away, however crowded the length gets.
+    Only the short lengths can ever get crowded - listing every code of a long one
+    would take more memory than there is.
+    """
+
+    def __init__(self, random_pool, crowded_fraction=0.5):
+        """ Initialize the reservations. """
+        self.random = random_pool
+        self.crowded_fraction = crowded_fraction
+        # reserved codes, by their lengths
+        self.reserved = {}
+        # shuffled free codes and their positions in the list, by the lengths which got crowded
+        self.free = {}
+        self.positions = {}
+        # number of codes handed out while all the codes of their lengths were taken
+        self.exhausted = 0
+
+    def allocate(self, length):
+        """ Reserve and return a random free code of the given length. """
+        reserved = self.reserved.setdefault(length, set())
+        if length not in self.free:
+            low, high = code_space(length)
+            if len(reserved) < (high - low) * self.crowded_fraction:
+                code = self.random.code(length)
+                while code in reserved:
+                    code = self.random.code(length)
+                reserved.add(code)
+                return code
+            self.shuffle(length)
+        return self.take(length)
+
+    def reserve(self, code):
+        """ Mark a code chosen elsewhere as taken. """
+        length = len(code)
+        self.reserved.setdefault(length, set()).add(code)
+        positions = self.positions.get(length)
+        if positions and code in positions:
+            # Swap the code with the last free one, then drop it.
+            free = self.free[length]
+            index = positions.pop(code)
+            last = free.pop()
+            if last != code:
+                free[index] = last
+                positions[last] = index
+
+    def release(self, code):
+        """ Make the code free again; do nothing if it was not reserved. """
+        length = len(code)
+        reserved = self.reserved.get(length)
+        if not reserved or code not in reserved:
+            return
+        reserved.discard(code)
+        free = self.free.get(length)
+        low, high = code_space(length)
+        if free is not None and code.isdigit() and low <= int(code) < high:
+            # Put the code at a random place, so that the list stays shuffled.
+            positions = self.positions[length]
+            free.append(code)
+            index = self.random.below(len(free))
+            other = free[index]
+            free[index], free[-1] = code, other
+            positions[other] = len(free) - 1
+            positions[code] = index
+
+    def count(self, length):
+        """ Return the number of reserved codes of the given length. """
+        reserved = self.reserved.get(length)
+        return len(reserved) if reserved else 0
+
+    # =============================================================
+    # crowded lengths
+
+    def shuffle(self, length):
+        """ Start keeping the free codes of the length in a shuffled list. """
+        reserved = self.reserved[length]
+        free = [code for code in map(str, self.random.permutation(*code_space(length)))
+                if code not in reserved]
+        self.free[length] = free
+        self.positions[length] = {code: index for index, code in enumerate(free)}
+
+    def take(self, length):
+        """ Reserve and return the code at the end of the shuffled free codes. """
+        free = self.free[length]
+        if not free:
+            # Every code is live - a duplicate is the only way out; find() resolves it to the oldest.
+            self.exhausted += 1
+            return self.random.code(length)
+        code = free.pop()
+        del self.positions[length][code]
+        self.reserved[length].add(code)
+        return code
@@ -0,0 +1,103 @@
+import unittest
+from CodeAllocator import CodeAllocator, code_space
+from RandomPool import RandomPool
+
+def create_allocator():
+    return CodeAllocator(RandomPool(seed=3, batch_size=16))
+
+class RepeatingPool(RandomPool):
+    """ Hand out the given codes first, then random ones. """
+
+    def __init__(self, codes):
+        super().__init__(seed=3, batch_size=16)
+        self.repeated = list(codes)
+
+    def code(self, length):
+        if self.repeated:
+            return self.repeated.pop(0)
+        return super().code(length)
+
+class TestCodeAllocator(unittest.TestCase):
+
+    # =============================================================
+    # test allocating
+
+    def test_should_allocate_every_code_once(self):
+        allocator = create_allocator()
+        low, high = code_space(2)
+        codes = [allocator.allocate(2) for i in range(high - low)]
+        self.assertEqual(sorted(codes), [str(code) for code in range(low, high)])
+        self.assertIn(2, allocator.free)
+        self.assertEqual(allocator.exhausted, 0)
+
+    def test_should_hand_out_duplicate_when_exhausted(self):
+        allocator = create_allocator()
+        codes = {allocator.allocate(1) for i in range(9)}
+        self.assertEqual(len(codes), 9)
+        self.assertIn(allocator.allocate(1), codes)
+        self.assertEqual(allocator.exhausted, 1)
+
+    def test_should_not_allocate_reserved_code(self):
+        allocator = create_allocator()
+        for code in range(1, 9):
+            allocator.reserve(str(code))
+        self.assertEqual(allocator.allocate(1), '9')
+        self.assertEqual(allocator.count(1), 9)
+
+    def test_should_keep_drawing_while_not_crowded(self):
+        allocator = CodeAllocator(RepeatingPool(['123456789'] * 10))
+        allocator.reserve('123456789')
+        code = allocator.allocate(9)
+        self.assertNotEqual(code, '123456789')
+        self.assertEqual(len(code), 9)
+        self.assertNotIn(9, allocator.free)
+
+    # =============================================================
+    # test releasing
+
+    def test_should_reallocate_released_codes(self):
+        allocator = create_allocator()
+        codes = [allocator.allocate(1) for i in range(9)]
+        allocator.release(codes[3])
+        allocator.release(codes[5])
+        allocator.release('0')
+        self.assertEqual({allocator.allocate(1), allocator.allocate(1)}, {codes[3], codes[5]})
+        self.assertEqual(allocator.exhausted, 0)
+
+    def test_should_keep_positions_consistent(self):
+        allocator = create_allocator()
+        codes = [allocator.allocate(2) for i in range(60)]
+        for code in codes[::2]:
+            allocator.release(code)
+        allocator.reserve(codes[0])
+        free = allocator.free[2]
+        positions = allocator.positions[2]
+        self.assertEqual(len(free), len(positions))
+        for code, index in positions.items():
+            self.assertEqual(free[index], code)
+        self.assertNotIn(codes[0], positions)
+
+# #############################################################
+# SUITES
+
+def suite_allocating():
+    suite = unittest.TestSuite()
+    suite.addTest(TestCodeAllocator('test_should_allocate_every_code_once'))
+    suite.addTest(TestCodeAllocator('test_should_hand_out_duplicate_when_exhausted'))
+    suite.addTest(TestCodeAllocator('test_should_not_allocate_reserved_code'))
+    suite.addTest(TestCodeAllocator('test_should_keep_drawing_while_not_crowded'))
+    return suite
+
+def suite_releasing():
+    suite = unittest.TestSuite()
+    suite.addTest(TestCodeAllocator('test_should_reallocate_released_codes'))
+    suite.addTest(TestCodeAllocator('test_should_keep_positions_consistent'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_allocating())
+    runner.run(suite_releasing())
@@ -1,12 +1,20 @@
 """ Provide a Color utility customized to the project needs. """
 
 import random
+from functools import lru_cache
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # ===================================================================================
 # deal with hex values
 
 HEX_VALUES = {'A':10, 'B':11, 'C':12, 'D':13, 'E':14, 'F':15}
 
+@lru_cache(maxsize=None)
 def dehex(_hex):
     """ Translate a two-digit hex value into a decimal value. """
     values_in = [_hex[0], _hex[1]]
@@ -37,6 +45,59 @@ class PseudoColor:
     def __str__(self):
         return str(self.to_tuple())
 
+# ===================================================================================
+# opacity blending
+
+class OpacityBlender:
+    """ Look up colors blended against a background, with the opacity quantized into steps. """
+
+    def __init__(self, bg_color, steps=100, max_tables=1024):
+        """ Initialize the lookup tables for the default background color. """
+        self.steps = steps
+        self.max_tables = max_tables
+        self.bg_color = bg_color
+        self.tables = {}
+        self.size = 0
+        self.default_tables = self.tables.setdefault(bg_color.to_tuple(), {})
+
+    def blend(self, color, opacity, bg_color=None):
+        """ Return an RGB tuple of the color against the background with given opacity. """
+        if bg_color is None:
+            tables = self.default_tables
+        else:
+            tables = self.tables.get(bg_color.to_tuple())
+            if tables is None:
+                tables = self.tables[bg_color.to_tuple()] = {}
+        rgb = color.to_tuple()
+        table = tables.get(rgb)
+        if table is None:
+            if self.size >= self.max_tables:
+                self.clear()
+            table = tables[rgb] = [None] * (self.steps + 1)
+            self.size += 1
+
+        if opacity <= 0:
+            step = 0
+        elif opacity >= 1:
+            step = self.steps
+        else:
+            step = int(opacity * self.steps + 0.5)
+
+        blended = table[step]
+        if blended is None:
+            bg = bg_color or self.bg_color
+            opacity = step / self.steps
+            blended = table[step] = (round(bg.r + (color.r - bg.r) * opacity),
+                                     round(bg.g + (color.g - bg.g) * opacity),
+                                     round(bg.b + (color.b - bg.b) * opacity))
+        return blended
+
+    def clear(self):
+        """ Forget all the calculated colors. """
+        for tables in self.tables.values():
+            tables.clear()
+        self.size = 0
+
 # ===================================================================================
 # color
 
@@ -46,30 +107,32 @@ class COL:
     @staticmethod
     def BLACK():
         """ Shorthand for creating one of the most useful colors. """
-        return Color(rgb=Color.BLACK)
+        return Color.shared(Color.BLACK)
 
     @staticmethod
     def WHITE():
         """ Shorthand for creating one of the most useful colors. """
-        return Color(rgb=Color.WHITE)
+        return Color.shared(Color.WHITE)
 
     @staticmethod
     def RED():
         """ Shorthand for creating one of the most useful colors. """
-        return Color(rgb=Color.RED)
+        return Color.shared(Color.RED)
 
     @staticmethod
     def GREEN():
         """ Shorthand for creating one of the most useful colors. """
-        return Color(rgb=Color.GREEN)
+        return Color.shared(Color.GREEN)
 
     @staticmethod
     def BLUE():
         """ Shorthand for creating one of the most useful colors. """
-        return Color(rgb=Color.BLUE)
+        return Color.shared(Color.BLUE)
     
 class Color:
-    """ Provide utility necessary for dealing with colors. """
+    """ Provide utility necessary for dealing with colors. Instances are immutable. """
+
+    __slots__ = ('r', 'g', 'b', 'rgb')
 
     # =============================================================
     # an enum of ready color tuples
@@ -80,16 +143,19 @@ class Color:
     GREEN = (0,   255, 0)
     BLUE  = (0,   0,   255)
 
+    # shared instances, by their color tuples
+    SHARED = {}
+
     # =============================================================
     # a random generator
 
     @staticmethod
     def random_color():
         """ Generate a totally random color. """
-        return Color(random.randint(0,255), random.randint(0,255), random.randint(0,255))
+        return Color.unchecked(random.randint(0,255), random.randint(0,255), random.randint(0,255))
 
     # =============================================================
-    # constructor
+    # constructors
 
     def __init__(self, r=-1, g=-1, b=-1, rgb=(-1,-1,-1), _hex=''):
         """ Read one of the provided values and initialize own RGB values. """
@@ -97,26 +163,22 @@ class Color:
 
         if _hex and _hex[:1] == '#':
             _hex = _hex[1:]
-            
-        self.r = r
-        self.g = g
-        self.b = b
+
+        new_r, new_g, new_b = r, g, b
         
         if not fail and rgb[0] >= 0 and rgb[1] >= 0 and rgb[2] >= 0:
-            self.r = rgb[0]
-            self.g = rgb[1]
-            self.b = rgb[2]
+            new_r, new_g, new_b = rgb
         elif len(_hex) == 6:
             _hex = _hex.upper()
-            self.r = dehex(_hex[0:2])
-            self.g = dehex(_hex[2:4])
-            self.b = dehex(_hex[4:6])
+            new_r = dehex(_hex[0:2])
+            new_g = dehex(_hex[2:4])
+            new_b = dehex(_hex[4:6])
 
-        self.r = round(self.r)
-        self.g = round(self.g)
-        self.b = round(self.b)
+        new_r = round(new_r)
+        new_g = round(new_g)
+        new_b = round(new_b)
 
-        for x in (self.r, self.g, self.b):
+        for x in (new_r, new_g, new_b):
             if x < 0 or x > 255:
                 fail = True
 
@@ -125,15 +187,53 @@ class Color:
             print('r = {}, g = {}, b = {}, rgb = {}, _hex = {}'.format(r, g, b, rgb, _hex))
             raise ValueError
 
+        self._assign(new_r, new_g, new_b)
+
+    @staticmethod
+    def unchecked(r, g, b):
+        """ Create a color from whole numbers known to be in the 0-255 range, skipping the checks. """
+        color = object.__new__(Color)
+        color._assign(r, g, b)
+        return color
+
+    @staticmethod
+    def shared(rgb):
+        """ Return the one instance shared by everybody for the color tuple. """
+        color = Color.SHARED.get(rgb)
+        if color is None:
+            color = Color.SHARED[rgb] = Color(rgb=rgb)
+        return color
+
+    def _assign(self, r, g, b):
+        """ Set the color values. Only to be used while the color is being created. """
+        object.__setattr__(self, 'r', r)
+        object.__setattr__(self, 'g', g)
+        object.__setattr__(self, 'b', b)
+        object.__setattr__(self, 'rgb', (r, g, b))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Color instances are immutable.')
+
+    def __reduce__(self):
+        return (Color.unchecked, self.rgb)
+
     # =============================================================
     # helpers
 
     def __str__(self):
-        return str(self.to_tuple())
+        return str(self.rgb)
+
+    def __eq__(self, other):
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self.rgb == other.rgb
+
+    def __hash__(self):
+        return hash(self.rgb)
 
     def to_tuple(self):
         """ Return a tuple with the color values. """
-        return (self.r, self.g, self.b)
+        return self.rgb
 
     # =============================================================
     # operations
@@ -156,47 +256,46 @@ class Color:
 
     @staticmethod
     def weighted_average(color1, color2, percent):
-        return Color(r = color1.r * (1-percent) + color2.r * percent,
-                     g = color1.g * (1-percent) + color2.g * percent,
-                     b = color1.b * (1-percent) + color2.b * percent)
+        """ Return a color between the two given ones; percent has to be in the 0-1 range. """
+        if not 0 <= percent <= 1:
+            raise ValueError('The percent has to be in the 0-1 range, not {}.'.format(percent))
+        return Color.unchecked(round(color1.r * (1-percent) + color2.r * percent),
+                               round(color1.g * (1-percent) + color2.g * percent),
+                               round(color1.b * (1-percent) + color2.b * percent))
 
     # =============================================================
     # corrections
 
     def apply_opacity(self, bg_color, opacity):
-        """ Calculate the color against a background color with given opacity. """
-        calc_diff = self - bg_color
-        # print('bg_color, opacity, calc_diff = {}, {}, {})'.format(bg_color, opacity, calc_diff))
-        return Color(r = bg_color.r + calc_diff.r * opacity,
-                     g = bg_color.g + calc_diff.g * opacity,
-                     b = bg_color.b + calc_diff.b * opacity)
+        """ Calculate the color against a background color with given opacity (0-1). """
+        if not 0 <= opacity <= 1:
+            raise ValueError('The opacity has to be in the 0-1 range, not {}.'.format(opacity))
+        return Color.unchecked(round(bg_color.r + (self.r - bg_color.r) * opacity),
+                               round(bg_color.g + (self.g - bg_color.g) * opacity),
+                               round(bg_color.b + (self.b - bg_color.b) * opacity))
 
     def correct_minimum_average(self, minimum):
-        """ Correct the color to have an average at the minimum level (0-255). """
+        """ Return the color corrected to have an average at the minimum level (0-255). """
         diff = 3 * minimum - self.sum()
         if diff > 0:
             # Apply a bit of randomness to not always produce the same color.
             diff += random.randint(0, 40)
             diff /= 3
-            self.r += diff
-            self.g += diff
-            self.b += diff
-            self.correct()
+            return self.correct(self.r + diff, self.g + diff, self.b + diff)
+        return self
 
     def correct_maximum_average(self, maximum):
-        """ Correct the color to have an average at the maximum level (0-255). """
+        """ Return the color corrected to have an average at the maximum level (0-255). """
         diff = 3 * maximum - self.sum()
         if diff < 0:
             # Apply a bit of randomness to not always produce the same color.
             diff -= random.randint(0, 40)
             diff /= 3
-            self.r += diff
-            self.g += diff
-            self.b += diff
-            self.correct()
+            return self.correct(self.r + diff, self.g + diff, self.b + diff)
+        return self
 
     def correct_avoid_gray(self):
-        """ Correct the color to not be gray. """
+        """ Return the color corrected to not be gray. """
         diff = abs((self.r-self.g) * (self.r-self.b) * (self.b-self.g))
         if diff < 1000:
             # choose a random color (not red though) and change it by 30-40
@@ -204,20 +303,110 @@ class Color:
             color_mod = random.randint(30, 40)
             color_mod *= 1 if self.r < 200 else -1
             if color_index == 1:
-                self.g += color_mod
-            else:
-                self.b += color_mod
-            self.correct()
+                return self.correct(self.r, self.g + color_mod, self.b)
+            return self.correct(self.r, self.g, self.b + color_mod)
+        return self
 
     def correct_avoid_red(self):
-        """ Correct the color to not be predominantly red. """
+        """ Return the color corrected to not be predominantly red. """
         if self.r - self.g > 40 and self.r - self.b > 40:
-            self.r = max(self.g, self.b) + 20
-
-    def correct(self):
-        """ Check whether manipulating color values hasn't gone too far. """
-        for x in (self.r, self.g, self.b):
-            if x < 0:
-                x = 0
-            elif x > 255:
-                x = 255
+            return self.correct(max(self.g, self.b) + 20, self.g, self.b)
+        return self
+
+    def correct(self, r=None, g=None, b=None):
+        """ Return a new color with the given values replaced, kept within the 0-255 range. """
+        r = self.r if r is None else r
+        g = self.g if g is None else g
+        b = self.b if b is None else b
+        return Color.unchecked(*(min(255, max(0, round(x))) for x in (r, g, b)))
+
+# ===================================================================================
+# color array
+
+class ColorArray:
+    """
+    Hold many colors in a single NumPy array for batch operations.
+
+    Like Color, the instances are never changed - every operation returns a new array.
+    Requires NumPy, unlike the rest of the module.
+    """
+
+    def __init__(self, values):
+        """ Store the colors from anything convertible to an N x 3 array. """
+        if np is None:
+            raise ImportError('ColorArray requires NumPy to be installed.')
+        values = np.asarray(values, dtype=np.float32)
+        if values.ndim != 2 or values.shape[1] != 3:
+            raise ValueError('ColorArray values have to be of N x 3 shape.')
+        self.values = values
+
+    @staticmethod
+    def from_colors(colors):
+        """ Create an array from an iterable of Colors. """
+        return ColorArray(list(map(attrgetter('rgb'), colors)) or np.empty((0, 3)))
+
+    def to_uint8(self):
+        """ Return the rounded and clamped values as an N x 3 array of bytes. """
+        return np.clip(np.rint(self.values), 0, 255).astype(np.uint8)
+
+    def to_tuples(self):
+        """ Return a list of color tuples. """
+        return list(map(tuple, self.to_uint8().tolist()))
+
+    def to_colors(self):
+        """ Return a list of Colors. """
+        return list(map(Color.unchecked, *self.to_uint8().T.tolist()))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        """ Return a single Color. """
+        return Color.unchecked(*self.to_uint8()[index].tolist())
+
+    # =============================================================
+    # operations
+
+    @staticmethod
+    def weighted_average(colors1, colors2, percent):
+        """ Return the colors between the two given arrays; percent can be a scalar or an array. """
+        percent = np.asarray(percent, dtype=np.float32).reshape(-1, 1) \
+                  if np.ndim(percent) else np.float32(percent)
+        return ColorArray(colors1.values * (1 - percent) + colors2.values * percent)
+
+    def blend(self, bg_color, opacity):
+        """ Calculate the colors against a background with given opacity (scalar or array). """
+        bg = bg_color.values if isinstance(bg_color, ColorArray) \
+             else np.asarray(bg_color.to_tuple(), dtype=np.float32)
+        opacity = np.asarray(opacity, dtype=np.float32).reshape(-1, 1) \
+                  if np.ndim(opacity) else np.float32(opacity)
+        return ColorArray(bg + (self.values - bg) * opacity)
+
+    def clamp(self):
+        """ Return the colors with the values kept within the 0-255 range. """
+        return ColorArray(np.clip(self.values, 0, 255))
+
+    def sums(self):
+        """ Return the sums of the color values. """
+        return self.values.sum(axis=1)
+
+    # =============================================================
+    # corrections
+
+    def correct_minimum_average(self, minimum, rng=None):
+        """ Correct the colors to have an average at least at the minimum level (0-255). """
+        diff = 3 * minimum - self.sums()
+        return self.shift_average(np.where(diff > 0, diff, 0), 1, rng)
+
+    def correct_maximum_average(self, maximum, rng=None):
+        """ Correct the colors to have an average at most at the maximum level (0-255). """
+        diff = 3 * maximum - self.sums()
+        return self.shift_average(np.where(diff < 0, diff, 0), -1, rng)
+
+    def shift_average(self, diff, sign, rng):
+        """ Shift the colors by the differences, with a bit of randomness, like Color does. """
+        rng = rng or np.random.default_rng()
+        # Apply a bit of randomness to not always produce the same color.
+        noise = rng.integers(0, 41, size=len(diff)) * sign
+        diff = np.where(diff != 0, diff + noise, 0) / 3
+        return ColorArray(self.values + diff.reshape(-1, 1)).clamp()
@@ -1,5 +1,5 @@
 import unittest
-from Color import Color
+from Color import Color, COL, OpacityBlender, ColorArray, np
 
 class TestColor(unittest.TestCase):
 
@@ -18,6 +18,29 @@ class TestColor(unittest.TestCase):
     def test_should_create_color_from_predefined_values(self):
         self.assertEqual(Color(rgb=Color.RED).to_tuple(),(255,0,0))
 
+    def test_should_create_color_unchecked(self):
+        self.assertEqual(Color.unchecked(1,2,3), Color(r=1,g=2,b=3))
+
+    def test_should_share_common_colors(self):
+        self.assertIs(COL.WHITE(), COL.WHITE())
+        self.assertIs(Color.shared((120,0,0)), Color.shared((120,0,0)))
+        self.assertEqual(COL.RED().to_tuple(), Color.RED)
+
+    def test_should_not_allow_changing_values(self):
+        color = Color(rgb=(41,42,43))
+        with self.assertRaises(AttributeError):
+            color.r = 0
+
+    def test_should_keep_hash_when_corrected(self):
+        color = Color(10,10,10)
+        colors = {color}
+        corrected = color.correct_minimum_average(100)
+        self.assertIn(color, colors)
+        self.assertEqual(color.to_tuple(), (10,10,10))
+        self.assertGreaterEqual(corrected.sum(), 300)
+        self.assertGreaterEqual(COL.BLACK().correct_minimum_average(60).sum(), 180)
+        self.assertEqual(COL.BLACK().to_tuple(), Color.BLACK)
+
     # =============================================================
     # test wrong initialization
 
@@ -80,6 +103,34 @@ class TestColor(unittest.TestCase):
         self.assertEqual(color1.apply_opacity(bg_color, opacity).to_tuple(),
                          (100,70,48))
 
+    def test_should_raise_error_on_wrong_opacity(self):
+        black = Color(rgb=Color.BLACK)
+        white = Color(rgb=Color.WHITE)
+        with self.assertRaises(ValueError):
+            Color.weighted_average(black, white, 2)
+        with self.assertRaises(ValueError):
+            white.apply_opacity(black, -0.5)
+        self.assertEqual(Color.weighted_average(black, white, 1), white)
+
+    def test_should_blend_like_apply_opacity(self):
+        bg_color = Color(rgb=(100,100,100))
+        blender = OpacityBlender(bg_color)
+        color1 = Color(rgb=(100,60,30))
+        for opacity in (0, 0.25, 0.5, 0.75, 1):
+            self.assertEqual(blender.blend(color1, opacity),
+                             color1.apply_opacity(bg_color, opacity).to_tuple())
+
+    def test_should_blend_against_other_background(self):
+        blender = OpacityBlender(Color(rgb=Color.BLACK))
+        bg_color = Color(rgb=Color.WHITE)
+        self.assertEqual(blender.blend(Color(rgb=Color.BLACK), 0.5, bg_color), (128,128,128))
+        self.assertEqual(blender.blend(Color(rgb=Color.BLACK), 0.5), (0,0,0))
+
+    def test_should_reuse_blended_tuples(self):
+        blender = OpacityBlender(Color(rgb=Color.BLACK))
+        color1 = Color(rgb=(100,50,200))
+        self.assertIs(blender.blend(color1, 0.5), blender.blend(Color(rgb=(100,50,200)), 0.5))
+
     # =============================================================
     # test adding and subtracting
 
@@ -116,9 +167,53 @@ class TestColor(unittest.TestCase):
         # given
         color_low_average = Color(rgb=(20,20,20))
         # when
-        color_low_average.correct_minimum_average(60)
+        corrected = color_low_average.correct_minimum_average(60)
         # then
-        self.assertGreaterEqual(color_low_average.sum(), 60)
+        self.assertGreaterEqual(corrected.sum(), 180)
+        self.assertLessEqual(corrected.correct_maximum_average(30).sum(), 90)
+        self.assertEqual(Color(rgb=(200,20,20)).correct_avoid_red().to_tuple(), (40,20,20))
+
+    # =============================================================
+    # test color arrays
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_should_convert_color_array(self):
+        colors = [Color(rgb=(1,2,3)), Color(rgb=(250,251,252))]
+        array = ColorArray.from_colors(colors)
+        self.assertEqual(len(array), 2)
+        self.assertEqual(array.to_colors(), colors)
+        self.assertEqual(array.to_tuples(), [(1,2,3), (250,251,252)])
+        self.assertEqual(array[1], colors[1])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_should_blend_color_array_like_colors(self):
+        bg_color = Color(rgb=(100,100,100))
+        colors = [Color(rgb=(100,60,30)), Color(rgb=(0,200,255))]
+        array = ColorArray.from_colors(colors)
+        self.assertEqual(array.blend(bg_color, 0.75).to_colors(),
+                         [color.apply_opacity(bg_color, 0.75) for color in colors])
+        self.assertEqual(array.blend(bg_color, [0, 1]).to_colors(),
+                         [bg_color, colors[1]])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_should_average_color_arrays(self):
+        array1 = ColorArray([(0,0,0), (200,20,20)])
+        array2 = ColorArray([(100,50,200), (20,200,20)])
+        self.assertEqual(ColorArray.weighted_average(array1, array2, 0.5).to_tuples(),
+                         [(50,25,100), (110,110,20)])
+        self.assertEqual(ColorArray.weighted_average(array1, array2, [0, 1]).to_tuples(),
+                         [(0,0,0), (20,200,20)])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_should_correct_color_array_averages(self):
+        array = ColorArray([(20,20,20), (200,200,200), (250,250,250)])
+        corrected = array.correct_minimum_average(60)
+        self.assertGreaterEqual(corrected.sums()[0], 180)
+        self.assertEqual(corrected.to_tuples()[1:], array.to_tuples()[1:])
+        corrected = array.correct_maximum_average(200)
+        self.assertLessEqual(corrected.sums()[2], 600)
+        self.assertEqual(corrected.to_tuples()[:2], array.to_tuples()[:2])
+        self.assertEqual(ColorArray([(-5,100,300)]).clamp().to_tuples(), [(0,100,255)])
 
 # #############################################################
 # SUITES
@@ -129,6 +224,10 @@ def suite_constructor():
     suite.addTest(TestColor('test_should_create_color_from_rgb_tuple_values'))
     suite.addTest(TestColor('test_should_create_color_from_hex_values'))
     suite.addTest(TestColor('test_should_create_color_from_predefined_values'))
+    suite.addTest(TestColor('test_should_create_color_unchecked'))
+    suite.addTest(TestColor('test_should_share_common_colors'))
+    suite.addTest(TestColor('test_should_not_allow_changing_values'))
+    suite.addTest(TestColor('test_should_keep_hash_when_corrected'))
     return suite
 
 def suite_constructor_wrong_calls():
@@ -143,6 +242,10 @@ def suite_opacity():
     suite = unittest.TestSuite()
     suite.addTest(TestColor('test_should_apply_opacity_case1'))
     suite.addTest(TestColor('test_should_apply_opacity_case2'))
+    suite.addTest(TestColor('test_should_raise_error_on_wrong_opacity'))
+    suite.addTest(TestColor('test_should_blend_like_apply_opacity'))
+    suite.addTest(TestColor('test_should_blend_against_other_background'))
+    suite.addTest(TestColor('test_should_reuse_blended_tuples'))
     return suite
 
 def suite_add_subtract():
@@ -163,6 +266,14 @@ def suite_corrections():
     suite.addTest(TestColor('test_should_correct_minimum_average'))
     return suite
 
+def suite_color_array():
+    suite = unittest.TestSuite()
+    suite.addTest(TestColor('test_should_convert_color_array'))
+    suite.addTest(TestColor('test_should_blend_color_array_like_colors'))
+    suite.addTest(TestColor('test_should_average_color_arrays'))
+    suite.addTest(TestColor('test_should_correct_color_array_averages'))
+    return suite
+
 # #############################################################
 # main
 
@@ -195,6 +306,7 @@ if __name__ == '__main__':
     total_tests += run_suite(runner, suite_add_subtract, 'ADDING AND SUBTRACTING')
     total_tests += run_suite(runner, suite_summing, 'SUMMING')
     total_tests += run_suite(runner, suite_corrections, 'CORRECTIONS')
+    total_tests += run_suite(runner, suite_color_array, 'COLOR ARRAYS')
 
     suite_intro('SUITE COMPLETENESS')
     print('Tests ran: ' + str(total_tests))
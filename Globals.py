@@ -1,11 +1,13 @@
 from enum import Enum
-from Color import Color
+from Color import Color, OpacityBlender
 
 FONT_SIZE = 48
+RECT_HEIGHT = FONT_SIZE + 12
 SPACER = 10
 window_surface = None
 BASIC_FONT = None
-BG_COLOR = Color(rgb=Color.BLACK)
+BG_COLOR = Color.shared(Color.BLACK)
+BLENDER = OpacityBlender(BG_COLOR)
 
 # class font (fontsize, font object)
 
@@ -82,11 +84,36 @@ def signed_int(value):
     else:
         return '+' + str(value)
 
+def hard_set_calculation(changer):
+    """ Calculate a value that does not depend on the requestor - once. """
+    value = int(changer.stiff_value + changer.base_value)
+    return lambda requestor: value
+
+def time_left_calculation(changer):
+    """ Calculate a value which grows with the part of the requestor's time that is left. """
+    stiff_value = changer.stiff_value
+    base_value = changer.base_value
+    return lambda requestor: int(stiff_value + base_value * requestor.calculate_time_percentage_left())
+
 class ValueChanger():
     """ Provide the utility for holding properties intended to modify other values. """
 
-    def __init__(self, strategy=None, stiff_value=0, base_value=0, base_multiplier=1, value=0, multiplier=1, display=''):
+    __slots__ = ('shared', '_strategy', '_stiff_value', '_base_value', 'base_multiplier',
+                 'value', 'multiplier', '_display', 'displayed_value', 'calculation')
+
+    # builders of the calculations, by strategies; each takes the instance and returns
+    # a function of the requestor, giving the integer value
+    CALCULATIONS = {RewardStrategy.HARD_SET: hard_set_calculation,
+                    RewardStrategy.TIME_LEFT: time_left_calculation,
+                    PenaltyStrategy.HARD_SET: hard_set_calculation,
+                    PenaltyStrategy.TIME_LEFT: time_left_calculation}
+
+    def __init__(self, strategy=None, stiff_value=0, base_value=0, base_multiplier=1, value=0, multiplier=1, display='',
+                 shared=False):
         """ Initialize the variables for the class instance. """
+        # Shared instances belong to prototypes and have to be copied before calculating.
+        self.shared = shared
+        self.calculation = None
         self.strategy = strategy
         self.stiff_value = stiff_value
         self.base_value = base_value
@@ -95,27 +122,222 @@ class ValueChanger():
         self.multiplier = multiplier
         self.display = display
 
+    @classmethod
+    def register(cls, strategy, builder):
+        """ Make the strategy calculate with the function returned by the builder. """
+        cls.CALCULATIONS[strategy] = builder
+
+    # The calculation is bound anew whenever any of its inputs changes.
+
+    @property
+    def strategy(self):
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, strategy):
+        self._strategy = strategy
+        self.calculation = None
+
+    @property
+    def stiff_value(self):
+        return self._stiff_value
+
+    @stiff_value.setter
+    def stiff_value(self, value):
+        self._stiff_value = value
+        self.calculation = None
+
+    @property
+    def base_value(self):
+        return self._base_value
+
+    @base_value.setter
+    def base_value(self, value):
+        self._base_value = value
+        self.calculation = None
+
+    @property
+    def display(self):
+        """ Return the last calculated value as a signed string, formatting it only when it changed. """
+        if self.displayed_value != self.value:
+            self._display = signed_int(self.value)
+            self.displayed_value = self.value
+        return self._display
+
+    @display.setter
+    def display(self, display):
+        self._display = display
+        self.displayed_value = self.value
+
+    def copy(self):
+        """ Return a copy of the instance that is not shared. """
+        vc = ValueChanger(strategy=self.strategy,
+                          stiff_value=self.stiff_value,
+                          base_value=self.base_value,
+                          base_multiplier=self.base_multiplier,
+                          value=self.value,
+                          multiplier=self.multiplier,
+                          display=self._display)
+        vc.displayed_value = self.displayed_value
+        vc.calculation = self.calculation
+        return vc
+
+    def bind(self):
+        """ Build the calculation of the current strategy and inputs. """
+        builder = self.CALCULATIONS.get(self.strategy)
+        if builder is None:
+            raise ValueError('No calculation registered for the strategy {}.'.format(self.strategy))
+        self.calculation = builder(self)
+        return self.calculation
+
     def calculate(self, requestor):
         """ Calculate the variable values for being used outside of the class. """
-        if self.strategy in RewardStrategy:
-            if self.strategy == RewardStrategy.HARD_SET:
-                self.value = self.stiff_value + self.base_value
-                self.multiplier = self.base_multiplier
-            elif self.strategy == RewardStrategy.TIME_LEFT:
-                self.value = self.stiff_value + self.base_value * requestor.calculate_time_percentage_left()
-                self.multiplier = self.base_multiplier
-            self.value = int(self.value)
-            self.display = signed_int(self.value)
-            return (self.value, self.multiplier)
-        
-        elif self.strategy in PenaltyStrategy:
-            if self.strategy == PenaltyStrategy.HARD_SET:
-                self.value = self.stiff_value + self.base_value
-                self.multiplier = self.base_multiplier
-            elif self.strategy == PenaltyStrategy.TIME_LEFT:
-                self.value = self.stiff_value + self.base_value * requestor.calculate_time_percentage_left()
-                self.multiplier = self.base_multiplier
-            self.value = int(self.value)
-            self.display = signed_int(self.value)
-            return (self.value, self.multiplier)
-            
+        calculation = self.calculation or self.bind()
+        self.value = calculation(requestor)
+        # Nothing is formatted for the new value yet, even if it equals the old one.
+        self.displayed_value = None
+        self.multiplier = self.base_multiplier
+        return (self.value, self.multiplier)
+
+class OrderedSet():
+    """ Keep unique items in the order of adding, with constant-time adding and removing. """
+
+    __slots__ = ('items',)
+
+    def __init__(self, items=()):
+        """ Initialize the set with the given items. """
+        # Dictionaries keep the order of insertion; the values are unused.
+        self.items = dict.fromkeys(items)
+
+    def add(self, item):
+        """ Add the item at the end, unless it is already present. """
+        self.items[item] = None
+
+    def discard(self, item):
+        """ Remove the item; do nothing if it is not present. """
+        self.items.pop(item, None)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+# a marker for the fields that have not been set
+MISSING = object()
+
+# fields of the attributes used by every Target; the rest go to the overflow mapping
+ATTRIBUTE_FIELDS = {Attribute.GARBAGE: 'garbage',
+                    Attribute.VALUE_STRATEGY: 'value_strategy',
+                    Attribute.TIME_CREATED: 'time_created',
+                    Attribute.TIME_TO_BE_SHOWN: 'time_to_be_shown',
+                    Attribute.TIME_TO_EXPIRE: 'time_to_expire',
+                    Attribute.REWARD: 'reward',
+                    Attribute.PENALTY: 'penalty',
+                    Attribute.STRENGTH: 'strength',
+                    Attribute.SPAWN_BLUEPRINT: 'spawn_blueprint',
+                    Attribute.COLORS: 'colors',
+                    Attribute.TARGET_TYPE: 'target_type',
+                    Attribute.WIDTH: 'width',
+                    Attribute.VALUE: 'value',
+                    Attribute.POSITION: 'position'}
+FIELD_ATTRIBUTES = {field: attribute for attribute, field in ATTRIBUTE_FIELDS.items()}
+
+class Attributes():
+    """
+    Hold the Attribute values of a Target or a blueprint.
+
+    The common attributes are kept in fields, to be read directly on the hot paths
+    (e.g. attributes.time_created); the rare ones go to a dictionary created on demand.
+    Either can also be accessed like in a dictionary keyed by Attribute.
+    A field that has not been set means the attribute is missing.
+    """
+
+    __slots__ = tuple(ATTRIBUTE_FIELDS.values()) + ('extra',)
+
+    def __init__(self, attributes=None):
+        """ Initialize the instance with the values from a dictionary or another instance. """
+        self.extra = None
+        if attributes:
+            self.update(attributes)
+
+    def __getitem__(self, attribute):
+        field = ATTRIBUTE_FIELDS.get(attribute)
+        if field:
+            try:
+                return getattr(self, field)
+            except AttributeError:
+                raise KeyError(attribute) from None
+        if self.extra and attribute in self.extra:
+            return self.extra[attribute]
+        raise KeyError(attribute)
+
+    def __setitem__(self, attribute, value):
+        field = ATTRIBUTE_FIELDS.get(attribute)
+        if field:
+            setattr(self, field, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[attribute] = value
+
+    def __delitem__(self, attribute):
+        field = ATTRIBUTE_FIELDS.get(attribute)
+        try:
+            if field:
+                delattr(self, field)
+            else:
+                del self.extra[attribute]
+        except (AttributeError, KeyError, TypeError):
+            raise KeyError(attribute) from None
+
+    def __contains__(self, attribute):
+        field = ATTRIBUTE_FIELDS.get(attribute)
+        if field:
+            return hasattr(self, field)
+        return bool(self.extra) and attribute in self.extra
+
+    def __bool__(self):
+        return any(True for item in self.items())
+
+    def get(self, attribute, default=None):
+        """ Return the value of the attribute, or the default if it is missing. """
+        try:
+            return self[attribute]
+        except KeyError:
+            return default
+
+    def items(self):
+        """ Yield the pairs of the present attributes and their values. """
+        for field, attribute in FIELD_ATTRIBUTES.items():
+            value = getattr(self, field, MISSING)
+            if value is not MISSING:
+                yield (attribute, value)
+        if self.extra:
+            yield from self.extra.items()
+
+    def keys(self):
+        """ Yield the present attributes. """
+        for attribute, value in self.items():
+            yield attribute
+
+    __iter__ = keys
+
+    def update(self, attributes):
+        """ Set the values from a dictionary or another instance. """
+        for attribute, value in attributes.items():
+            self[attribute] = value
+
+    def copy(self):
+        """ Return a shallow copy of the instance. """
+        copy = Attributes()
+        for field in ATTRIBUTE_FIELDS.values():
+            value = getattr(self, field, MISSING)
+            if value is not MISSING:
+                setattr(copy, field, value)
+        if self.extra:
+            copy.extra = self.extra.copy()
+        return copy
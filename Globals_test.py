@@ -0,0 +1,128 @@
+import unittest
+from Globals import Attribute as AT
+from Globals import Attributes, OrderedSet, ValueChanger, RewardStrategy, PenaltyStrategy
+
+class FakeRequestor:
+    """ Stand in for a Target with a fixed part of its time left. """
+
+    def __init__(self, percentage_left):
+        self.percentage_left = percentage_left
+
+    def calculate_time_percentage_left(self):
+        return self.percentage_left
+
+class TestGlobals(unittest.TestCase):
+
+    # =============================================================
+    # test attributes
+
+    def test_should_access_attributes_by_key_and_field(self):
+        attributes = Attributes({AT.VALUE: '123'})
+        attributes[AT.POSITION] = 2
+        self.assertEqual(attributes.value, '123')
+        self.assertEqual(attributes[AT.POSITION], 2)
+        self.assertIn(AT.POSITION, attributes)
+        self.assertNotIn(AT.STRENGTH, attributes)
+        with self.assertRaises(KeyError):
+            attributes[AT.STRENGTH]
+        self.assertEqual(attributes.get(AT.STRENGTH, 4), 4)
+
+    def test_should_keep_rare_attributes_in_overflow(self):
+        attributes = Attributes()
+        self.assertIsNone(attributes.extra)
+        attributes[AT.FRAME_WIDTH] = 5
+        self.assertEqual(attributes.extra, {AT.FRAME_WIDTH: 5})
+        self.assertEqual(dict(attributes.items()), {AT.FRAME_WIDTH: 5})
+
+    def test_should_copy_attributes(self):
+        attributes = Attributes({AT.VALUE: '1', AT.FRAME_WIDTH: 5})
+        copy = attributes.copy()
+        copy[AT.VALUE] = '2'
+        copy[AT.FRAME_WIDTH] = 6
+        self.assertEqual(attributes[AT.VALUE], '1')
+        self.assertEqual(attributes[AT.FRAME_WIDTH], 5)
+        del copy[AT.VALUE]
+        self.assertNotIn(AT.VALUE, copy)
+
+    # =============================================================
+    # test value changers
+
+    def test_should_calculate_by_strategy(self):
+        vc = ValueChanger(strategy=RewardStrategy.TIME_LEFT, stiff_value=10.5, base_value=100)
+        self.assertEqual(vc.calculate(FakeRequestor(0.5)), (60, 1))
+        self.assertEqual(vc.display, '+60')
+        vc = ValueChanger(strategy=PenaltyStrategy.HARD_SET, stiff_value=-4, base_value=-5, base_multiplier=2)
+        self.assertEqual(vc.calculate(FakeRequestor(0.5)), (-9, 2))
+        self.assertEqual(vc.display, '-9')
+
+    def test_should_display_zero_value(self):
+        vc = ValueChanger(strategy=RewardStrategy.HARD_SET)
+        self.assertEqual(vc.calculate(None), (0, 1))
+        self.assertEqual(vc.display, '+0')
+        self.assertEqual(vc.copy().display, '+0')
+
+    def test_should_rebind_when_inputs_change(self):
+        vc = ValueChanger(strategy=RewardStrategy.HARD_SET, stiff_value=1)
+        self.assertEqual(vc.calculate(None), (1, 1))
+        vc.stiff_value = 5
+        self.assertEqual(vc.calculate(None), (5, 1))
+        vc.strategy = RewardStrategy.TIME_LEFT
+        vc.base_value = 10
+        self.assertEqual(vc.calculate(FakeRequestor(1)), (15, 1))
+        vc.strategy = None
+        with self.assertRaises(ValueError):
+            vc.calculate(None)
+
+    def test_should_register_new_strategy(self):
+        strategy = object()
+        ValueChanger.register(strategy, lambda changer: lambda requestor: changer.stiff_value * 2)
+        try:
+            vc = ValueChanger(strategy=strategy, stiff_value=21)
+            self.assertEqual(vc.calculate(None), (42, 1))
+            self.assertEqual(vc.copy().calculate(None), (42, 1))
+        finally:
+            del ValueChanger.CALCULATIONS[strategy]
+
+    # =============================================================
+    # test ordered sets
+
+    def test_should_keep_order_of_unique_items(self):
+        items = OrderedSet(['a', 'b'])
+        items.add('c')
+        items.add('a')
+        items.discard('b')
+        items.discard('d')
+        self.assertEqual(list(items), ['a', 'c'])
+        self.assertEqual(len(items), 2)
+
+# #############################################################
+# SUITES
+
+def suite_attributes():
+    suite = unittest.TestSuite()
+    suite.addTest(TestGlobals('test_should_access_attributes_by_key_and_field'))
+    suite.addTest(TestGlobals('test_should_keep_rare_attributes_in_overflow'))
+    suite.addTest(TestGlobals('test_should_copy_attributes'))
+    return suite
+
+def suite_value_changer():
+    suite = unittest.TestSuite()
+    suite.addTest(TestGlobals('test_should_calculate_by_strategy'))
+    suite.addTest(TestGlobals('test_should_display_zero_value'))
+    suite.addTest(TestGlobals('test_should_rebind_when_inputs_change'))
+    suite.addTest(TestGlobals('test_should_register_new_strategy'))
+    return suite
+
+def suite_ordered_set():
+    suite = unittest.TestSuite()
+    suite.addTest(TestGlobals('test_should_keep_order_of_unique_items'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_attributes())
+    runner.run(suite_value_changer())
+    runner.run(suite_ordered_set())
@@ -1,17 +1,67 @@
 import pygame
-from pygame.time import get_ticks
+from Clock import get_ticks
+from collections import OrderedDict
 
 from Globals import SPACER
 from Globals import FONT_SIZE
-from Globals import BG_COLOR
+from Globals import RECT_HEIGHT
+from Globals import BLENDER
 
-from Color import Color
+from Color import Color, COL
+
+# ===================================================================================
+
+class TextRenderCache:
+    """ Keep the most recently rendered text surfaces to avoid rendering them again. """
+
+    def __init__(self, max_size=256):
+        """ Set initial values for the instance. """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, value, color):
+        """ Return a surface with the text rendered in the given color tuple. """
+        key = (font, value, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(value, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """ Forget all the rendered surfaces and reset the counters. """
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """ Return a dictionary describing the cache usage. """
+        return {'size': len(self.surfaces),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+text_cache = TextRenderCache()
 
 # ===================================================================================
 
 class Displayable:
     """ Display a static entity on the screen. """
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, x=0, y=0):
         self.x = x
         self.y = y
@@ -25,6 +75,19 @@ class Displayable:
         """ Get the display position of the instance. """
         return (self.x, self.y)
 
+    def get_rect(self):
+        """ Get the screen area covered by the instance. """
+        return pygame.Rect(self.x, self.y, 0, 0)
+
+    def draw_state(self):
+        """
+        Get a value describing everything that affects the drawing of the instance.
+
+        If the value differs from the one of the previous frame, the instance needs
+        to be redrawn. None means the instance cannot tell and is always redrawn.
+        """
+        return None
+
     def draw(self):
         """ Draw the instance on the screen. """
         print('draw() method has not been overwriteen.')
@@ -34,7 +97,10 @@ class Displayable:
 class DisplayableText(Displayable):
     """ Display a static text on the screen. """
 
-    def __init__(self, font, value='', color=Color(rgb=Color.WHITE),  \
+    __slots__ = ('value', 'color', 'opacity', 'align', 'font', 'owner_rect', 'text_rect',
+                 'rendered', 'rendered_key')
+
+    def __init__(self, font, value='', color=COL.WHITE(),  \
                  owner_rect=pygame.Rect(0,0,0,0), align='lc'):
         """ Set initial values for the instance. """
         super().__init__()
@@ -44,6 +110,8 @@ class DisplayableText(Displayable):
         self.align = align
         self.font = font
         self.owner_rect = owner_rect
+        self.rendered = None
+        self.rendered_key = None
         self.set_values()
 
     def set_position(self, x, y):
@@ -68,7 +136,7 @@ class DisplayableText(Displayable):
         if value:
             self.value = str(value)
         
-        text = self.font.render(self.value, True, Color.WHITE)
+        text = text_cache.render(self.font, self.value, Color.WHITE)
         text_rect = text.get_rect()
 
         if text_rect:
@@ -96,18 +164,31 @@ class DisplayableText(Displayable):
         text_rect.top += self.y
         self.text_rect = text_rect
 
+    def get_rect(self):
+        """ Get the screen area covered by the instance. """
+        return self.text_rect.copy()
+
+    def draw_state(self):
+        """ Get a value describing everything that affects the drawing of the instance. """
+        return (self.font, self.value, self.color.to_tuple(), self.opacity, self.get_rect())
+
     def draw(self):
         """ Draw the instance on the screen. """
-        text_color = self.color.apply_opacity(BG_COLOR, self.opacity).to_tuple()
-        text = self.font.render(self.value, True, text_color)    
-        window_surface.blit(text, self.text_rect)
+        text_color = BLENDER.blend(self.color, self.opacity)
+        key = (self.font, self.value, text_color)
+        if key != self.rendered_key:
+            self.rendered = text_cache.render(self.font, self.value, text_color)
+            self.rendered_key = key
+        window_surface.blit(self.rendered, self.text_rect)
 
 # ===================================================================================
 
 class FadingText(DisplayableText):
     """ Display a text with the fading effect. """
 
-    def __init__(self, font, value, color=Color(rgb=Color.WHITE), \
+    __slots__ = ('fadeout_active', 'fadein_active', 'fadeout_start', 'fadein_start')
+
+    def __init__(self, font, value, color=COL.WHITE(), \
                  owner_rect=pygame.Rect(0,0,0,0), align='lc', opacity=0):
         """ Set initial values for the instance. """
         super().__init__(value=value, font=font, color=color, \
@@ -158,9 +239,11 @@ class FadingText(DisplayableText):
 class GUIRect(Displayable):
     """ Display a colored rectangle on the screen. """
 
+    __slots__ = ('width', 'height', 'colors', 'frame_width')
+
     # Set up widely-used constants.
     WIDTH = FONT_SIZE * 1.2
-    HEIGHT = FONT_SIZE + 12
+    HEIGHT = RECT_HEIGHT
     
     def __init__(self, x=0, y=0, width=1, height=1):
         """ Set initial values for the instance. """
@@ -168,11 +251,24 @@ class GUIRect(Displayable):
         self.height = height
         self.x = x
         self.y = y
-        self.colors = {'frame': Color(rgb=Color.WHITE),
-                       'bg': Color(rgb=Color.BLACK),
-                       'text': Color(rgb=Color.WHITE)}
+        self.colors = {'frame': COL.WHITE(),
+                       'bg': COL.BLACK(),
+                       'text': COL.WHITE()}
         self.frame_width = 3
 
+    def get_rect(self):
+        """ Get the screen area covered by the instance. """
+        # Allow for the fractional sizes being rounded up while drawing.
+        return pygame.Rect(self.x, self.y, self.width + 1, self.height + 1)
+
+    def draw_state(self):
+        """ Get a value describing everything that affects the drawing of the instance. """
+        return (self.get_rect(),
+                self.frame_width,
+                self.colors['frame'].to_tuple(),
+                self.colors['bg'].to_tuple(),
+                self.colors['text'].to_tuple())
+
     def draw(self):
         if not window_surface:
             return
@@ -182,7 +278,7 @@ class GUIRect(Displayable):
 
     def draw_frame(self, opacity=1):
         """ Draw the frame and inside of the rectangle. """       
-        rect_color = self.colors['frame'].apply_opacity(BG_COLOR, opacity).to_tuple()
+        rect_color = BLENDER.blend(self.colors['frame'], opacity)
         rect_space = (self.x, self.y, self.width, self.height)
         pygame.draw.rect(window_surface, rect_color, rect_space)
 
@@ -200,6 +296,8 @@ class GUIRect(Displayable):
 class GUIRectWithText(GUIRect):
     """ Display a colored rectangle with text inside on the screen. """
 
+    __slots__ = ('text', 'value', 'opacity')
+
     def __init__(self, width=1, font=None, text=None):
         """ Set initial values for the instance. """
         if not font and not text:
@@ -227,6 +325,10 @@ class GUIRectWithText(GUIRect):
     def set_value(self, value):
         """ Pass value to be set to the child. """
         self.text.set_values(value=value)
+
+    def draw_state(self):
+        """ Get a value describing everything that affects the drawing of the instance. """
+        return (super().draw_state(), self.text.draw_state())
         
     def draw(self):
         """ Draw the instance on the screen. """
@@ -238,6 +340,8 @@ class GUIRectWithText(GUIRect):
 class KeyButton(GUIRectWithText):
     """ Add a key-connection layer to the rectangle with text. """
 
+    __slots__ = ('keyup_function',)
+
     def __init__(self, font, value, color, size=(1,1), keyup_function=None):
         """ Set initial values for the instance. """
         super().__init__(text=FadingText(font=font, value=value, color=color, align='cc'))
@@ -270,6 +374,8 @@ class KeyButton(GUIRectWithText):
 class InputBox(GUIRectWithText):
     """ Accept and display text input. """
 
+    __slots__ = ()
+
     MAX_LEN = 12
         
     def set_value(self, value):
@@ -0,0 +1,67 @@
+import unittest
+from Gui import TextRenderCache
+
+class FakeFont:
+    """ Count the render calls instead of rendering anything. """
+
+    def __init__(self):
+        self.renders = 0
+
+    def render(self, value, antialias, color):
+        self.renders += 1
+        return (value, color)
+
+class TestTextRenderCache(unittest.TestCase):
+
+    # =============================================================
+    # test hits and misses
+
+    def test_should_render_once_for_repeated_requests(self):
+        font = FakeFont()
+        cache = TextRenderCache()
+        first = cache.render(font, '123', (255,255,255))
+        second = cache.render(font, '123', (255,255,255))
+        self.assertIs(first, second)
+        self.assertEqual(font.renders, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_should_render_again_for_different_color(self):
+        font = FakeFont()
+        cache = TextRenderCache()
+        cache.render(font, '123', (255,255,255))
+        cache.render(font, '123', (128,128,128))
+        self.assertEqual(font.renders, 2)
+
+    # =============================================================
+    # test eviction
+
+    def test_should_evict_least_recently_used(self):
+        font = FakeFont()
+        cache = TextRenderCache(max_size=2)
+        cache.render(font, '1', (0,0,0))
+        cache.render(font, '2', (0,0,0))
+        cache.render(font, '1', (0,0,0))
+        cache.render(font, '3', (0,0,0))
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.stats()['size'], 2)
+        cache.render(font, '1', (0,0,0))
+        self.assertEqual(font.renders, 3)
+        cache.render(font, '2', (0,0,0))
+        self.assertEqual(font.renders, 4)
+
+# #############################################################
+# SUITES
+
+def suite_text_cache():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTextRenderCache('test_should_render_once_for_repeated_requests'))
+    suite.addTest(TestTextRenderCache('test_should_render_again_for_different_color'))
+    suite.addTest(TestTextRenderCache('test_should_evict_least_recently_used'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_text_cache())
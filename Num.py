@@ -1,32 +1,44 @@
 import pygame
 import sys
 from pygame.locals import *
-from pygame.time import get_ticks
+import Clock
+from Clock import get_ticks
 import random
 from Globals import Trigger as TR
 from Globals import Action as AC
 from Globals import Attribute as AT
-from Globals import SPACER, window_surface, BASIC_FONT, ValueStrategy, TargetType, BG_COLOR, \
+from Globals import SPACER, FONT_SIZE, window_surface, BASIC_FONT, ValueStrategy, TargetType, BG_COLOR, \
      ANIMATION_LENGTH, STRENGTH_INCREASE, VICTORY_POINTS
+from Globals import OrderedSet
 import Globals
 import Gui
 import TargetModule
 from TargetModule import Target, TargetBlueprint
-from TargetFactory import TargetFactory
-from Color import Color
+from Simulation import Simulation, SimulationObserver, ScoreKeeper
+from Scheduler import Scheduler
+from Color import Color, COL
 
 # ===================================================================================
 
 class Game:
     """ Run the main game loop. """
 
-    def __init__(self):
-        """ Start the game running. """
+    def __init__(self, dirty_rects=False, vectorized_targets=False, seed=None, clock=None):
+        """ Start the game running; the time is read from the given clock, if any. """
+        # Choose whether the screens redraw only the areas that have changed.
+        self.dirty_rects = dirty_rects
+        # Choose whether the Targets' timers are processed in NumPy columns.
+        self.vectorized_targets = vectorized_targets
+        # Seed of the Targets' codes and colors; None for a different game every time.
+        self.seed = seed
+        self.drawn_screen = None
+
         # Load the globally-shared variables.
         global window_surface
         
-        # Set up pygame.
+        # Set up pygame and the time.
         pygame.init()
+        self.clock = Clock.install(clock or Clock.GameClock())
 
         # Set up the window.
         self.window_size = (640, 480)
@@ -52,7 +64,6 @@ class Game:
         self.current_screen = self.screens['main_screen']
 
     def finish(self, victory=False):
-        self.score_keeper.finish(victory)
         self.screens['end_screen'] = EndScreen(self)
         self.screens['end_screen'].setup(self.score_keeper)
         self.current_screen = self.screens['end_screen']
@@ -60,12 +71,17 @@ class Game:
     def mainmenu(self):
         self.current_screen = self.screens['welcome_screen']
         
-    def main(self):
-        """ Keep the game running. """
+    def main(self, fps=60, tick_rate=60, catch_up=True):
+        """ Keep the game running, with the logic and the drawing paced separately. """
+        scheduler = Scheduler(fps=fps, tick_rate=tick_rate, catch_up=catch_up)
         while True:
-            self.current_screen.events()
-            self.current_screen.update()
+            for tick in range(scheduler.ticks_due()):
+                self.clock.tick()
+                self.current_screen.events()
+                self.current_screen.update()
             self.current_screen.draw()
+            self.current_screen.idle()
+            scheduler.wait_for_frame()
 
     def close(self):
         """ Exit the game. """
@@ -74,13 +90,30 @@ class Game:
 
 # ===================================================================================
 
+def merge_rects(rects):
+    """ Join the overlapping rectangles together and drop the empty ones. """
+    merged = []
+    for rect in rects:
+        if not rect.width or not rect.height:
+            continue
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+# ===================================================================================
+
 class GameScreen:
     """ Base class for every screen in the game. """
 
     def __init__(self, owner):
         """ Initialize the variables of the screen. """
-        self.gui = []
-        self.gui_updatable = []
+        self.gui = OrderedSet()
+        self.gui_updatable = OrderedSet()
+        self.drawn = {}
         self.key_events = {KEYUP:{}, KEYDOWN:{}}
         # functions
         self.owner = owner
@@ -92,19 +125,17 @@ class GameScreen:
 
     def add_gui(self, new_gui):
         """ Add a new GUI element to the drawing queue. """
-        self.gui.append(new_gui)
+        self.gui.add(new_gui)
 
     def add_gui_updatable(self, new_gui):
         """ Add a new GUI element to the updatable drawing queue. """
         self.add_gui(new_gui)
-        self.gui_updatable.append(new_gui)
+        self.gui_updatable.add(new_gui)
 
     def remove_gui(self, garbage):
         """ Remove a GUI from the drawing queue(s). """
-        if garbage in self.gui_updatable:
-            self.gui_updatable.remove(garbage)
-        if garbage in self.gui:
-            self.gui.remove(garbage)
+        self.gui_updatable.discard(garbage)
+        self.gui.discard(garbage)
 
     def events(self):
         """ Process events (mostly keystrokes). """
@@ -119,13 +150,62 @@ class GameScreen:
         for updatable in self.gui_updatable:
             updatable.update()       
         
+    def idle(self):
+        """ Do the preparations that can wait for the spare time after a frame is drawn. """
+        pass
+
     def draw(self):
         """ Draw GUI on the screen. """
+        if self.owner.dirty_rects:
+            self.draw_dirty()
+            return
         window_surface.fill((0, 0, 0))
         for element in self.gui:
             element.draw()
         pygame.display.update()
 
+    def draw_dirty(self):
+        """ Redraw only the areas of the screen covered by the GUI that has changed. """
+        full_redraw = self.owner.drawn_screen is not self
+        self.owner.drawn_screen = self
+
+        dirty = []
+        drawn = {}
+        for element in self.gui:
+            if element in drawn:
+                continue
+            state = element.draw_state()
+            rect = element.get_rect()
+            drawn[element] = (state, rect)
+            previous = self.drawn.pop(element, None)
+            if state is None or not previous or previous[0] != state:
+                dirty.append(rect)
+                if previous:
+                    dirty.append(previous[1])
+        # Whatever is left was removed from the queue since the last frame.
+        for state, rect in self.drawn.values():
+            dirty.append(rect)
+        self.drawn = drawn
+
+        if full_redraw:
+            window_surface.fill((0, 0, 0))
+            for element in self.gui:
+                element.draw()
+            pygame.display.update()
+            return
+
+        dirty = merge_rects(dirty)
+        if not dirty:
+            return
+        for rect in dirty:
+            window_surface.set_clip(rect)
+            window_surface.fill((0, 0, 0))
+            for element in self.gui:
+                if rect.colliderect(drawn[element][1]):
+                    element.draw()
+        window_surface.set_clip(None)
+        pygame.display.update(dirty)
+
 # ===================================================================================
 
 class Collector:
@@ -159,43 +239,6 @@ class Collector:
 
 # ===================================================================================
 
-class ScoreKeeper():
-    """ Store the data about user performance. """
-
-    def __init__(self):
-        """ Initialize the variables. """
-        self.points_gained = 0
-        self.points_lost = 0
-        self.targets_shot = 0
-        self.targets_timed_out = 0
-        self.misses = 0
-
-    def begin(self):
-        self.time_began = get_ticks()
-
-    def finish(self, victory):
-        self.victory = victory
-        time_elapsed_seconds = (get_ticks() - self.time_began) // 1000
-        time_elapsed_minutes = time_elapsed_seconds // 60
-        time_elapsed_seconds -= time_elapsed_minutes * 60
-        time_elapsed = ''
-        if time_elapsed_minutes:
-            time_elapsed = '{} minute'.format(time_elapsed_minutes) \
-                           + ('s ' if time_elapsed_minutes > 1 else ' ')
-        if time_elapsed_seconds:
-            time_elapsed += '{} second'.format(time_elapsed_seconds) \
-                            + ('s ' if time_elapsed_seconds > 1 else ' ')
-        self.time_elapsed = time_elapsed
-        accuracy = 0
-        effectiveness = 0
-        if self.targets_shot:
-            accuracy = int((self.targets_shot / (self.targets_shot + self.misses)) * 100)
-            effectiveness = int((self.targets_shot / (self.targets_shot + self.targets_timed_out)) * 100)
-        self.accuracy = accuracy
-        self.effectiveness = effectiveness
-
-# ===================================================================================
-
 class WelcomeScreen(GameScreen):
     """ Display and control the main menu of the game. """
 
@@ -208,7 +251,7 @@ class WelcomeScreen(GameScreen):
         # Create the title display.
         self.title_display = Gui.DisplayableText(value='num.type',
                                                  font=WELCOME_FONT_TITLE,
-                                                 color=Color(rgb=Color.WHITE),
+                                                 color=COL.WHITE(),
                                                  align='cc')
         self.title_display.set_position(640/2, 40)
         self.add_gui(self.title_display)
@@ -225,7 +268,7 @@ class WelcomeScreen(GameScreen):
         # Create the subtitle display.
         self.subtitle_display = Gui.DisplayableText(value='a numerical typing game',
                                                     font=WELCOME_FONT_TITLE,
-                                                    color=Color(rgb=Color.WHITE),
+                                                    color=COL.WHITE(),
                                                     align='cc')
         self.subtitle_display.set_position(640/2, 70)
         self.add_gui(self.subtitle_display)
@@ -253,7 +296,7 @@ class WelcomeScreen(GameScreen):
         for instruction in instructions:
             new_display = Gui.DisplayableText(value=instruction,
                                               font=WELCOME_FONT_INSTRUCTIONS,
-                                              color=Color(rgb=Color.WHITE),
+                                              color=COL.WHITE(),
                                               align='lc')
             new_display.set_position(20, 120 + 23 * len(self.instr_displays))
             self.instr_displays.append(new_display)
@@ -301,8 +344,9 @@ class EndScreen(GameScreen):
 
     def __init__(self, owner):
         """ Initialize the variables of the screen. Overwritten for modified setup call. """
-        self.gui = []
-        self.gui_updatable = []
+        self.gui = OrderedSet()
+        self.gui_updatable = OrderedSet()
+        self.drawn = {}
         self.key_events = {KEYUP:{}, KEYDOWN:{}}
         self.owner = owner
 
@@ -314,7 +358,7 @@ class EndScreen(GameScreen):
         # Create the main message.
         self.message = Gui.DisplayableText(value='VICTORY' if score_keeper.victory else 'DEFEAT',
                                            font=BASIC_FONT,
-                                           color=Color(rgb=Color.WHITE),
+                                           color=COL.WHITE(),
                                            align='cc')
         self.message.set_position(640/2, 40)
         self.add_gui(self.message)
@@ -336,7 +380,7 @@ class EndScreen(GameScreen):
         for score in scores:
             new_display = Gui.DisplayableText(value=score,
                                               font=SCORE_FONT,
-                                              color=Color(rgb=Color.WHITE),
+                                              color=COL.WHITE(),
                                               align='lc')
             new_display.set_position(20, 100 + 30 * len(self.score_displays))
             self.score_displays.append(new_display)
@@ -352,7 +396,7 @@ class EndScreen(GameScreen):
                     
 # ===================================================================================
 
-class MainScreen(GameScreen):
+class MainScreen(GameScreen, SimulationObserver):
     """ Display and control the main screen of the game. """
 
     def setup(self):
@@ -409,7 +453,7 @@ class MainScreen(GameScreen):
         # Create the score display.
         self.hp_display = Gui.DisplayableText(value='♥♥♥',
                                               font=BASIC_FONT,
-                                              color=Color(rgb=Color.WHITE),
+                                              color=COL.WHITE(),
                                               align='rc')
         self.hp_display.set_position(640 - SPACER, 400)
         self.add_gui(self.hp_display)
@@ -417,7 +461,7 @@ class MainScreen(GameScreen):
         # Create the HP display.
         self.score_display = Gui.DisplayableText(value='Score: 0',
                                                  font=BASIC_FONT,
-                                                 color=Color(rgb=Color.WHITE),
+                                                 color=COL.WHITE(),
                                                  align='lc')
         self.score_display.set_position(SPACER, 400)
         self.add_gui(self.score_display)
@@ -425,7 +469,7 @@ class MainScreen(GameScreen):
         # Create the HP lost display.
         self.hp_lost_display = Gui.FadingText(value='♥',
                                               font=BASIC_FONT,
-                                              color=Color(rgb=Color.RED),
+                                              color=COL.RED(),
                                               align='lc')
         self.hp_lost_display.deactivate()
         self.add_gui(self.hp_lost_display)
@@ -439,34 +483,31 @@ class MainScreen(GameScreen):
                                     margin_x=5)
         self.add_gui(self.input_box)
 
-        # Set up the TargetFactory.
-        func_dict = {AC.REWARD: self.reward,
-                     AC.PENALTY: self.penalty,
-                     AC.DESPAWN_GOOD: self.despawn_good,
-                     AC.DESPAWN_BAD: self.despawn_bad,
-                     AC.DESPAWN_NONENTITY: self.despawn_nonentity,
-                     AC.SPAWN: self.spawn}
-        self.target_factory = TargetFactory(functions=func_dict,
-                                            after_adder=self.after_adder,
-                                            board_position=self.input_box.get_position(),
-                                            board_width=self.input_box.width,
-                                            font=BASIC_FONT)
-
-        # Set up a simple game.
-        self.score = 0
-        self.hp = 10
-        for i in range(4):
-            blueprint = TargetBlueprint()         
-            blueprint.attributes[AT.TARGET_TYPE] = TargetType.TIMED
-            blueprint.attributes[AT.STRENGTH] = 3 - STRENGTH_INCREASE
-            self.target_factory.create(blueprint)
-        self.owner.score_keeper.begin()
+        # Set up the rules of the game, with this screen showing what happens.
+        # The board of Targets ends where the score and HP displays begin.
+        board_top = self.input_box.get_position()[1] + Gui.GUIRect.HEIGHT + SPACER
+        board_bottom = self.hp_display.y - FONT_SIZE // 2
+        self.simulation = Simulation(observers=[self],
+                                     score_keeper=self.owner.score_keeper,
+                                     target_class=Target,
+                                     font=BASIC_FONT,
+                                     board_position=self.input_box.get_position(),
+                                     board_width=self.input_box.width,
+                                     board_height=board_bottom - board_top,
+                                     vectorized=self.owner.vectorized_targets,
+                                     seed=self.owner.seed)
+        self.target_factory = self.simulation.factory
+        self.simulation.start()
 
         # Set up the key events map.
         for code in keycodes:
            self.key_events[KEYUP][code] = [self.keys[code].keyup]
            self.key_events[KEYDOWN][code] = [self.keys[code].keydown]
         self.key_events[KEYUP][K_ESCAPE] = [self.clear_or_surrender]
+        self.key_events[KEYUP][K_UP] = [lambda: self.target_factory.scroll(-1)]
+        self.key_events[KEYUP][K_DOWN] = [lambda: self.target_factory.scroll(1)]
+        self.key_events[KEYUP][K_PAGEUP] = [lambda: self.target_factory.scroll(-self.target_factory.board.page)]
+        self.key_events[KEYUP][K_PAGEDOWN] = [lambda: self.target_factory.scroll(self.target_factory.board.page)]
         self.key_events[KEYUP][8] = [self.collector.backspace]       # backspace
         self.key_events[KEYUP][271].append(self.shoot_target)        # enter
         # Below function disabled in the current one-mode-only game.
@@ -474,9 +515,6 @@ class MainScreen(GameScreen):
         self.key_events[KEYUP][46] = self.key_events[KEYUP][266]     # .=,
         self.key_events[KEYDOWN][46] = self.key_events[KEYDOWN][266] # .=,
 
-        # Perform the first update to show GUI properly.
-        self.update_score()
-
     def events(self):
         """ Process events (mostly keystrokes). """
         events_to_process = super().events()
@@ -487,21 +525,23 @@ class MainScreen(GameScreen):
                         action()
 
     def update(self):
-        """ Perform garbage collection and update the updatable GUI. """
+        """ Update the updatable GUI and let the game rules react to time passing. """
         super().update()
-        garbage = []
-        for target in self.target_factory.targets:
-            if target.attributes[AT.GARBAGE]:
-                garbage.append(target)
-        while len(garbage):
-            target = garbage.pop()
-            self.remove_gui(target)
+        self.simulation.update()
+
+    def draw(self):
+        """ Prepare the draw parameters of the Targets in one go, if they are vectorized, then draw the screen. """
+        self.target_factory.prepare_draw()
+        super().draw()
+
+    def idle(self):
+        """ Refill the random codes and colors running low, so that spawning never has to. """
+        self.target_factory.random.top_up()
 
     def remove_gui(self, garbage):
-        """ Remove the element from the drawing queue(s) and from the list of Targets, if applicable. """
+        """ Remove the element from the drawing queue(s) and from the Targets, if applicable. """
         super().remove_gui(garbage)
-        if garbage in self.target_factory.targets:
-            self.target_factory.targets.remove(garbage)   
+        self.target_factory.remove(garbage)
 
     # GAME LOGIC
     # =================================================================================
@@ -511,11 +551,13 @@ class MainScreen(GameScreen):
             self.collector.pop()
             self.update_input_box()
         else:
-            self.owner.finish(False)
+            self.simulation.finish(False)
 
     def update_input_box(self):
-        """ Update the value displayed in the input box. """
-        self.input_box.set_value(''.join(self.collector.collected))
+        """ Update the value displayed in the input box, in red if it cannot hit any Target. """
+        value = ''.join(self.collector.collected)
+        self.input_box.text.color = COL.WHITE() if self.target_factory.can_match(value) else COL.RED()
+        self.input_box.set_value(value)
 
     def add_target(self):
         """ Add a new Target at user's behest. """
@@ -525,110 +567,36 @@ class MainScreen(GameScreen):
         blueprint.attributes[AT.STRENGTH] = 4
         self.target_factory.create(blueprint)
 
-    def spawn(self, requestor):
-        """ Spawn a new Target. """
-        RA = requestor.attributes
-        if not RA[AT.GARBAGE]:
-            blueprint = RA[AT.SPAWN_BLUEPRINT]
-            blueprint.attributes[AT.TIME_TO_BE_SHOWN] = get_ticks() + ANIMATION_LENGTH
-            self.target_factory.create(blueprint)
-        
-    def after_adder(self, new_target):
-        """ Add the new Target to the GUI queues of the screen. """
-        self.gui.append(new_target)
-        self.gui_updatable.append(new_target)
-        
     def shoot_target(self):
-        """ Attempt to shoot a Target. If successful, receive reward; otherwise, lose HP. """
-        value = self.collector.pop()
-        if not value:
-            return
-        found = None
-        for target in self.target_factory.targets:
-            if target.matches(value):
-                found = target
-                break
-        if found:
-            self.owner.score_keeper.targets_shot += 1
-            found.fire_trigger(TR.SHOT_AT)
-        else:
-            self.owner.score_keeper.misses += 1
-            self.lose_hp()
+        """ Attempt to shoot a Target with the collected value. """
+        self.simulation.shoot(self.collector.pop())
+
+    # SIMULATION OBSERVER
+    # =================================================================================
+
+    def target_added(self, target):
+        """ Add a Target that came into sight to the drawing queue. """
+        self.add_gui(target)
 
-    def lose_hp(self):
-        """ Lose 1 point of HP. """
+    def target_removed(self, target):
+        """ Take a Target off the drawing queue; its fate is up to the Simulation. """
+        super().remove_gui(target)
+
+    def hp_lost(self):
+        """ Show the heart being lost. """
         self.hp_lost_display.set_position(self.hp_display.x - self.hp_display.text_rect.width,
                                           self.hp_display.y)
         self.hp_lost_display.activate()
         self.hp_lost_display.fadeout()
-        self.hp -= 1
-        self.update_score()
-        self.check_end()
 
-    def update_score(self):
+    def score_changed(self, score, hp):
         """ Display the current score and HP. """
-        self.score_display.set_values(value='Score: {}'.format(self.score))
-        self.hp_display.set_values(value='♥' * self.hp)
-
-    def score_change(self, value=0, multiplier=1):
-        """ Change the user's score. """
-        if value > 0:
-            self.owner.score_keeper.points_gained += value
-        else:
-            self.owner.score_keeper.points_lost -= value
-        self.score += value
-        self.score *= multiplier
-        self.score = int(self.score)
-        self.update_score()
-        self.check_end()
-
-    def reward(self, requestor):
-        """ Process a reward from a shot Target. """
-        value, multiplier = requestor.calculate_reward()
-        self.score_change(value, multiplier)
-
-    def penalty(self, requestor):
-        """ Process a penalty from a timed-out Target. """
-        value, multiplier = requestor.calculate_penalty()
-        self.score_change(value, multiplier)
-
-    def despawn_good(self, requestor):
-        """ Mark a shot Target as garbage and display its dying animation. """
-        requestor.attributes[AT.GARBAGE] = True
-        blueprint = TargetBlueprint()
-        attr = blueprint.attributes
-        attr[AT.TARGET_TYPE] = TargetType.DYING_ANIMATION
-        attr[AT.VALUE] = requestor.attributes[AT.REWARD].display
-        attr[AT.COLORS] = {'frame': Color(rgb=Color.BLACK),
-                           'bg': requestor.colors['text'],
-                           'text': Color(rgb=Color.BLACK)}
-        attr[AT.POSITION] = requestor.attributes[AT.POSITION]
-        self.target_factory.create(blueprint)
-
-    def despawn_bad(self, requestor):
-        """ Mark a timed-out Target as garbage and display its dying animation. """
-        self.owner.score_keeper.targets_timed_out += 1
-        requestor.attributes[AT.GARBAGE] = True               
-        blueprint = TargetBlueprint()
-        attr = blueprint.attributes
-        attr[AT.TARGET_TYPE] = TargetType.DYING_ANIMATION
-        attr[AT.VALUE] = requestor.attributes[AT.PENALTY].display
-        attr[AT.COLORS] = {'frame': Color(rgb=Color.RED),
-                           'bg': Color(rgb=(120, 0, 0)),
-                           'text': Color(rgb=Color.RED)}
-        attr[AT.POSITION] = requestor.attributes[AT.POSITION]
-        self.target_factory.create(blueprint)
-
-    def despawn_nonentity(self, requestor):
-        """ Mark an animation-only Target as garbage. """
-        requestor.attributes[AT.GARBAGE] = True
+        self.score_display.set_values(value='Score: {}'.format(score))
+        self.hp_display.set_values(value='♥' * hp)
 
-    def check_end(self):
-        """ Checks whether any game-end condition has been reached. """
-        if not self.hp or self.score < 0:
-            self.owner.finish(False)
-        elif self.score >= VICTORY_POINTS:
-            self.owner.finish(True)
+    def game_finished(self, victory):
+        """ Move on to the end screen. """
+        self.owner.finish(victory)
 
 # ===================================================================================
 
@@ -0,0 +1,137 @@
+""" Provide the random values of the Targets, generated ahead of time in batches. """
+
+import random
+
+from Color import Color
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MINIMUM_AVERAGE = 125
+
+def random_length(length, generator=random):
+    """ Produce a random integer of a given length. """
+    return str(generator.randint((10 ** length) // 9, 10 ** length - 1))
+
+def random_text_color(generator=random):
+    """ Produce a random color that has a minimum average RGB value and is not too reddish. """
+    minimum_average = MINIMUM_AVERAGE
+    green = generator.randint(0, 255)
+    blue = generator.randint(max(0, int(minimum_average * 2 - green)), 255)
+    red = generator.randint(0, int(max(green, blue) * 0.66))
+    color_array = [red, green, blue]
+    below_min = 3 * minimum_average - sum(color_array)
+    while below_min > 1:
+        color_array = [round(x + min(below_min / 3, 255 - x)) for x in color_array]
+        below_min = 3 * minimum_average - sum(color_array)
+    return Color(rgb=tuple(color_array))
+
+class RandomPool:
+    """
+    Hand out the random codes and text colors of the Targets from buffers.
+
+    The buffers are filled in batches - with a NumPy Generator if NumPy is available,
+    otherwise one value at a time with the standard generator - so that spawning only pops.
+    """
+
+    def __init__(self, seed=None, batch_size=128, low_water=16):
+        """ Initialize the generator and the empty buffers. """
+        self.batch_size = batch_size
+        # buffers holding fewer values than this get topped up in the spare time
+        self.low_water = low_water
+        self.refills = 0
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """ Start generating anew from the seed; the values generated so far are dropped. """
+        self.seed = seed
+        if np is not None:
+            self.generator = np.random.default_rng(seed)
+        else:
+            # Without a seed, keep sharing the state of the standard generator.
+            self.generator = random if seed is None else random.Random(seed)
+        # buffers of codes, by their lengths
+        self.codes = {}
+        self.colors = []
+
+    def code(self, length):
+        """ Return a random code of the given number of digits. """
+        buffer = self.codes.get(length)
+        if not buffer:
+            buffer = self.refill_codes(length)
+        return buffer.pop()
+
+    def text_color(self):
+        """ Return a random color suitable for the text of a Target. """
+        if not self.colors:
+            self.refill_colors()
+        return self.colors.pop()
+
+    def below(self, count):
+        """ Return a random whole number from 0 up to, but not including, the count. """
+        if np is None:
+            return self.generator.randrange(count)
+        return int(self.generator.integers(count))
+
+    def permutation(self, low, high):
+        """ Return the whole numbers from low up to, but not including, high in a random order. """
+        if np is None:
+            return self.generator.sample(range(low, high), high - low)
+        return self.generator.permutation(np.arange(low, high)).tolist()
+
+    def top_up(self):
+        """ Refill the buffers running low; return the number of buffers refilled. """
+        refilled = 0
+        for length, buffer in self.codes.items():
+            if len(buffer) < self.low_water:
+                self.refill_codes(length)
+                refilled += 1
+        if len(self.colors) < self.low_water:
+            self.refill_colors()
+            refilled += 1
+        return refilled
+
+    # =============================================================
+    # batches
+
+    def refill_codes(self, length):
+        """ Add a batch of codes of the given length to the buffer and return the buffer. """
+        buffer = self.codes.setdefault(length, [])
+        if np is None:
+            batch = [random_length(length, self.generator) for i in range(self.batch_size)]
+        else:
+            low = (10 ** length) // 9
+            batch = [str(code) for code in
+                     self.generator.integers(low, 10 ** length, self.batch_size).tolist()]
+        # The buffers are popped from the end - keep the older values at the end.
+        buffer[:0] = batch
+        self.refills += 1
+        return buffer
+
+    def refill_colors(self):
+        """ Add a batch of text colors to the buffer. """
+        if np is None:
+            batch = [random_text_color(self.generator) for i in range(self.batch_size)]
+        else:
+            batch = [Color.unchecked(*rgb) for rgb in self.text_color_batch().tolist()]
+        self.colors[:0] = batch
+        self.refills += 1
+
+    def text_color_batch(self):
+        """ Return an array of text colors following the rules of random_text_color. """
+        generator = self.generator
+        size = self.batch_size
+        green = generator.integers(0, 256, size)
+        blue = generator.integers(np.maximum(MINIMUM_AVERAGE * 2 - green, 0), 256)
+        red = generator.integers(0, (np.maximum(green, blue) * 0.66).astype(np.int64) + 1)
+        rgb = np.stack((red, green, blue), axis=1).astype(np.float64)
+        below_min = 3 * MINIMUM_AVERAGE - rgb.sum(axis=1)
+        rows = below_min > 1
+        while rows.any():
+            raised = rgb[rows] + np.minimum(below_min[rows, None] / 3, 255 - rgb[rows])
+            rgb[rows] = np.round(raised)
+            below_min = 3 * MINIMUM_AVERAGE - rgb.sum(axis=1)
+            rows = below_min > 1
+        return rgb.astype(np.int64)
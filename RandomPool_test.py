@@ -0,0 +1,83 @@
+import unittest
+import RandomPool
+from RandomPool import RandomPool as Pool
+
+class TestRandomPool(unittest.TestCase):
+
+    # =============================================================
+    # test generating
+
+    def check_codes(self, pool):
+        for length in (1, 3, 9):
+            for i in range(300):
+                code = pool.code(length)
+                self.assertEqual(len(code), length)
+                self.assertGreaterEqual(int(code), (10 ** length) // 9)
+
+    def check_colors(self, pool):
+        for i in range(300):
+            color = pool.text_color()
+            for value in color.rgb:
+                self.assertTrue(0 <= value <= 255)
+            self.assertGreaterEqual(sum(color.rgb), 3 * RandomPool.MINIMUM_AVERAGE - 1)
+
+    def test_should_generate_valid_values(self):
+        pool = Pool(seed=1, batch_size=64)
+        self.check_codes(pool)
+        self.check_colors(pool)
+
+    def test_should_generate_valid_values_without_numpy(self):
+        np = RandomPool.np
+        RandomPool.np = None
+        try:
+            pool = Pool(seed=1, batch_size=64)
+            self.check_codes(pool)
+            self.check_colors(pool)
+        finally:
+            RandomPool.np = np
+
+    def test_should_repeat_values_of_seed(self):
+        first = Pool(seed=7)
+        second = Pool(seed=7)
+        self.assertEqual([first.code(4) for i in range(200)], [second.code(4) for i in range(200)])
+        self.assertEqual([first.text_color() for i in range(200)], [second.text_color() for i in range(200)])
+        first.reseed(7)
+        second.reseed(7)
+        self.assertEqual(first.code(5), second.code(5))
+
+    # =============================================================
+    # test refilling
+
+    def test_should_top_up_buffers_running_low(self):
+        pool = Pool(seed=1, batch_size=20, low_water=5)
+        pool.code(3)
+        pool.text_color()
+        self.assertEqual(pool.top_up(), 0)
+        for i in range(15):
+            pool.code(3)
+        self.assertEqual(pool.top_up(), 1)
+        self.assertEqual(len(pool.codes[3]), 24)
+        self.assertEqual(len(pool.colors), 19)
+
+# #############################################################
+# SUITES
+
+def suite_generating():
+    suite = unittest.TestSuite()
+    suite.addTest(TestRandomPool('test_should_generate_valid_values'))
+    suite.addTest(TestRandomPool('test_should_generate_valid_values_without_numpy'))
+    suite.addTest(TestRandomPool('test_should_repeat_values_of_seed'))
+    return suite
+
+def suite_refilling():
+    suite = unittest.TestSuite()
+    suite.addTest(TestRandomPool('test_should_top_up_buffers_running_low'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_generating())
+    runner.run(suite_refilling())
@@ -0,0 +1,59 @@
+""" Provide the pacing of the main loop: a fixed logic tick rate and a capped frame rate. """
+
+import time
+
+class Scheduler:
+    """ Decide when to run logic ticks and when to render frames. """
+
+    def __init__(self, fps=60, tick_rate=60, catch_up=True, max_ticks_per_frame=5,
+                 spin_margin=0.002, clock=time.perf_counter, sleep=time.sleep):
+        """ Initialize the variables of the scheduler. """
+        if fps <= 0 or tick_rate <= 0 or max_ticks_per_frame < 1:
+            raise ValueError('Frame rate, tick rate and ticks per frame have to be positive.')
+        self.frame_interval = 1 / fps
+        self.tick_interval = 1 / tick_rate
+        self.catch_up = catch_up
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.spin_margin = spin_margin
+        self.clock = clock
+        self.sleep = sleep
+        self.ticks_dropped = 0
+        self.frames_late = 0
+        self.start()
+
+    def start(self):
+        """ Begin counting both the ticks and the frames from now. """
+        now = self.clock()
+        self.next_tick = now
+        self.next_frame = now + self.frame_interval
+
+    def ticks_due(self):
+        """ Return the number of logic ticks that should be run before the next frame. """
+        now = self.clock()
+        if now < self.next_tick:
+            return 0
+        due = int((now - self.next_tick) / self.tick_interval) + 1
+        limit = self.max_ticks_per_frame if self.catch_up else 1
+        if due > limit:
+            # Too far behind to ever catch up - forget about the missing ticks.
+            self.ticks_dropped += due - limit
+            self.next_tick = now + self.tick_interval
+            return limit
+        self.next_tick += due * self.tick_interval
+        return due
+
+    def wait_for_frame(self):
+        """ Sleep until the next frame should be rendered. """
+        deadline = self.next_frame
+        remaining = deadline - self.clock()
+        if remaining > self.spin_margin:
+            self.sleep(remaining - self.spin_margin)
+        # The sleep is not precise enough by itself, so spin for the rest of the time.
+        while self.clock() < deadline:
+            pass
+        self.next_frame += self.frame_interval
+        now = self.clock()
+        if now > self.next_frame:
+            # A whole frame was missed - start counting anew instead of rushing.
+            self.frames_late += 1
+            self.next_frame = now + self.frame_interval
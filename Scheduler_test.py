@@ -0,0 +1,98 @@
+import unittest
+from Scheduler import Scheduler
+
+class FakeTime:
+    """ Provide a clock that only moves when slept on or moved by hand. """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def create_scheduler(fake_time, **kwargs):
+    return Scheduler(spin_margin=0, clock=fake_time.clock, sleep=fake_time.sleep, **kwargs)
+
+class TestScheduler(unittest.TestCase):
+
+    # =============================================================
+    # test ticks
+
+    def test_should_run_one_tick_at_start(self):
+        scheduler = create_scheduler(FakeTime())
+        self.assertEqual(scheduler.ticks_due(), 1)
+        self.assertEqual(scheduler.ticks_due(), 0)
+
+    def test_should_run_ticks_independently_of_frames(self):
+        fake_time = FakeTime()
+        scheduler = create_scheduler(fake_time, fps=25, tick_rate=100)
+        scheduler.ticks_due()
+        scheduler.wait_for_frame()
+        self.assertAlmostEqual(fake_time.now, 0.04)
+        self.assertEqual(scheduler.ticks_due(), 4)
+
+    def test_should_catch_up_on_dropped_frames(self):
+        fake_time = FakeTime()
+        scheduler = create_scheduler(fake_time, tick_rate=100, max_ticks_per_frame=5)
+        scheduler.ticks_due()
+        fake_time.now = 0.035
+        self.assertEqual(scheduler.ticks_due(), 3)
+        fake_time.now = 1
+        self.assertEqual(scheduler.ticks_due(), 5)
+        self.assertGreater(scheduler.ticks_dropped, 0)
+
+    def test_should_not_catch_up_when_disabled(self):
+        fake_time = FakeTime()
+        scheduler = create_scheduler(fake_time, tick_rate=100, catch_up=False)
+        scheduler.ticks_due()
+        fake_time.now = 0.035
+        self.assertEqual(scheduler.ticks_due(), 1)
+
+    # =============================================================
+    # test frames
+
+    def test_should_sleep_until_next_frame(self):
+        fake_time = FakeTime()
+        scheduler = create_scheduler(fake_time, fps=50)
+        fake_time.now = 0.005
+        scheduler.wait_for_frame()
+        self.assertAlmostEqual(fake_time.now, 0.02)
+        scheduler.wait_for_frame()
+        self.assertAlmostEqual(fake_time.now, 0.04)
+
+    def test_should_resynchronize_after_missed_frame(self):
+        fake_time = FakeTime()
+        scheduler = create_scheduler(fake_time, fps=50)
+        fake_time.now = 0.1
+        scheduler.wait_for_frame()
+        self.assertEqual(scheduler.frames_late, 1)
+        scheduler.wait_for_frame()
+        self.assertAlmostEqual(fake_time.now, 0.12)
+
+# #############################################################
+# SUITES
+
+def suite_ticks():
+    suite = unittest.TestSuite()
+    suite.addTest(TestScheduler('test_should_run_one_tick_at_start'))
+    suite.addTest(TestScheduler('test_should_run_ticks_independently_of_frames'))
+    suite.addTest(TestScheduler('test_should_catch_up_on_dropped_frames'))
+    suite.addTest(TestScheduler('test_should_not_catch_up_when_disabled'))
+    return suite
+
+def suite_frames():
+    suite = unittest.TestSuite()
+    suite.addTest(TestScheduler('test_should_sleep_until_next_frame'))
+    suite.addTest(TestScheduler('test_should_resynchronize_after_missed_frame'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_ticks())
+    runner.run(suite_frames())
@@ -0,0 +1,249 @@
+""" Run the rules of the game - spawning, timeouts, scoring, HP and victory - without pygame. """
+
+from Clock import get_ticks
+
+from Globals import Trigger as TR
+from Globals import Action as AC
+from Globals import Attribute as AT
+from Globals import TargetType, ANIMATION_LENGTH, STRENGTH_INCREASE, VICTORY_POINTS
+from Color import Color, COL
+from TargetCore import TargetBlueprint, SimTarget
+from TargetFactory import TargetFactory, TIMED_FORMULAS
+
+STARTING_HP = 10
+STARTING_TARGETS = 4
+
+# ===================================================================================
+
+class ScoreKeeper():
+    """ Store the data about user performance. """
+
+    def __init__(self):
+        """ Initialize the variables. """
+        self.points_gained = 0
+        self.points_lost = 0
+        self.targets_shot = 0
+        self.targets_timed_out = 0
+        self.misses = 0
+
+    def begin(self):
+        self.time_began = get_ticks()
+
+    def finish(self, victory):
+        self.victory = victory
+        time_elapsed_seconds = (get_ticks() - self.time_began) // 1000
+        time_elapsed_minutes = time_elapsed_seconds // 60
+        time_elapsed_seconds -= time_elapsed_minutes * 60
+        time_elapsed = ''
+        if time_elapsed_minutes:
+            time_elapsed = '{} minute'.format(time_elapsed_minutes) \
+                           + ('s ' if time_elapsed_minutes > 1 else ' ')
+        if time_elapsed_seconds:
+            time_elapsed += '{} second'.format(time_elapsed_seconds) \
+                            + ('s ' if time_elapsed_seconds > 1 else ' ')
+        self.time_elapsed = time_elapsed
+        accuracy = 0
+        effectiveness = 0
+        if self.targets_shot:
+            accuracy = int((self.targets_shot / (self.targets_shot + self.misses)) * 100)
+            effectiveness = int((self.targets_shot / (self.targets_shot + self.targets_timed_out)) * 100)
+        self.accuracy = accuracy
+        self.effectiveness = effectiveness
+
+# ===================================================================================
+
+class SimulationObserver:
+    """ Get notified of what happens in a Simulation. Every method does nothing by default. """
+
+    def target_added(self, target):
+        """ React to a Target appearing on the visible part of the board. """
+        pass
+
+    def target_removed(self, target):
+        """ React to a Target leaving the visible part of the board. """
+        pass
+
+    def hp_lost(self):
+        """ React to the player losing a point of HP, before the new HP is announced. """
+        pass
+
+    def score_changed(self, score, hp):
+        """ React to a change of the score or HP. """
+        pass
+
+    def game_finished(self, victory):
+        """ React to the end of the game. """
+        pass
+
+# ===================================================================================
+
+class Simulation:
+    """ Play the game by its rules, letting the observers know about everything that happens. """
+
+    def __init__(self, observers=(), score_keeper=None, target_class=SimTarget, font=None,
+                 board_position=(0, 0), board_width=300, board_height=None, vectorized=False, seed=None,
+                 strength_increase=STRENGTH_INCREASE, victory_points=VICTORY_POINTS, formulas=TIMED_FORMULAS):
+        """ Set up the Targets; nothing happens until the game is started. """
+        self.observers = list(observers)
+        self.score_keeper = score_keeper or ScoreKeeper()
+        self.score = 0
+        self.hp = STARTING_HP
+        self.finished = False
+        self.victory = None
+        self.strength_increase = strength_increase
+        self.victory_points = victory_points
+
+        func_dict = {AC.REWARD: self.reward,
+                     AC.PENALTY: self.penalty,
+                     AC.DESPAWN_GOOD: self.despawn_good,
+                     AC.DESPAWN_BAD: self.despawn_bad,
+                     AC.DESPAWN_NONENTITY: self.despawn_nonentity,
+                     AC.SPAWN: self.spawn}
+        self.factory = TargetFactory(functions=func_dict,
+                                     after_adder=self.target_added,
+                                     after_remover=self.target_removed,
+                                     board_position=board_position,
+                                     board_width=board_width,
+                                     board_height=board_height,
+                                     font=font,
+                                     vectorized=vectorized,
+                                     seed=seed,
+                                     target_class=target_class,
+                                     strength_increase=strength_increase,
+                                     formulas=formulas)
+
+    def start(self):
+        """ Spawn the first Targets and start counting the time. """
+        for i in range(STARTING_TARGETS):
+            blueprint = TargetBlueprint()
+            blueprint.attributes[AT.TARGET_TYPE] = TargetType.TIMED
+            blueprint.attributes[AT.STRENGTH] = 3 - self.strength_increase
+            self.factory.create(blueprint)
+        self.score_keeper.begin()
+        self.announce_score()
+
+    def update(self):
+        """ Expire the Targets that are due and perform garbage collection. """
+        self.factory.expire_due()
+        for target in self.factory.collect_garbage():
+            self.target_removed(target)
+
+    # OBSERVERS
+    # =================================================================================
+
+    def target_added(self, target):
+        for observer in self.observers:
+            observer.target_added(target)
+
+    def target_removed(self, target):
+        for observer in self.observers:
+            observer.target_removed(target)
+
+    def announce_score(self):
+        for observer in self.observers:
+            observer.score_changed(self.score, self.hp)
+
+    # GAME LOGIC
+    # =================================================================================
+
+    def shoot(self, value):
+        """ Attempt to shoot the Target with the value. If successful, receive reward; otherwise, lose HP. """
+        if not value:
+            return None
+        found = self.factory.find(value)
+        if found:
+            self.score_keeper.targets_shot += 1
+            found.fire_trigger(TR.SHOT_AT)
+            self.factory.broadcast(TR.SHOT_AT_ANOTHER, source=found)
+        else:
+            self.score_keeper.misses += 1
+            self.factory.broadcast(TR.SHOT_MISSED)
+            self.lose_hp()
+        return found
+
+    def spawn(self, requestor):
+        """ Spawn a new Target. """
+        RA = requestor.attributes
+        if not RA.garbage:
+            blueprint = RA[AT.SPAWN_BLUEPRINT]
+            blueprint.attributes[AT.TIME_TO_BE_SHOWN] = get_ticks() + ANIMATION_LENGTH
+            self.factory.create(blueprint)
+
+    def lose_hp(self):
+        """ Lose 1 point of HP. """
+        self.hp -= 1
+        self.factory.broadcast(TR.LOST_HP)
+        for observer in self.observers:
+            observer.hp_lost()
+        self.announce_score()
+        self.check_end()
+
+    def score_change(self, value=0, multiplier=1):
+        """ Change the user's score. """
+        if value > 0:
+            self.score_keeper.points_gained += value
+        else:
+            self.score_keeper.points_lost -= value
+        self.score += value
+        self.score *= multiplier
+        self.score = int(self.score)
+        self.announce_score()
+        self.check_end()
+
+    def reward(self, requestor):
+        """ Process a reward from a shot Target. """
+        value, multiplier = requestor.calculate_reward()
+        self.score_change(value, multiplier)
+
+    def penalty(self, requestor):
+        """ Process a penalty from a timed-out Target. """
+        value, multiplier = requestor.calculate_penalty()
+        self.score_change(value, multiplier)
+
+    def despawn_good(self, requestor):
+        """ Mark a shot Target as garbage and display its dying animation. """
+        self.factory.despawn(requestor)
+        blueprint = TargetBlueprint()
+        attr = blueprint.attributes
+        attr[AT.TARGET_TYPE] = TargetType.DYING_ANIMATION
+        attr[AT.VALUE] = requestor.attributes[AT.REWARD].display
+        attr[AT.COLORS] = {'frame': COL.BLACK(),
+                           'bg': requestor.attributes[AT.COLORS]['text'],
+                           'text': COL.BLACK()}
+        attr[AT.POSITION] = requestor.attributes[AT.POSITION]
+        self.factory.create(blueprint)
+
+    def despawn_bad(self, requestor):
+        """ Mark a timed-out Target as garbage and display its dying animation. """
+        self.score_keeper.targets_timed_out += 1
+        self.factory.despawn(requestor)
+        blueprint = TargetBlueprint()
+        attr = blueprint.attributes
+        attr[AT.TARGET_TYPE] = TargetType.DYING_ANIMATION
+        attr[AT.VALUE] = requestor.attributes[AT.PENALTY].display
+        attr[AT.COLORS] = {'frame': COL.RED(),
+                           'bg': Color.shared((120, 0, 0)),
+                           'text': COL.RED()}
+        attr[AT.POSITION] = requestor.attributes[AT.POSITION]
+        self.factory.create(blueprint)
+
+    def despawn_nonentity(self, requestor):
+        """ Mark an animation-only Target as garbage. """
+        self.factory.despawn(requestor)
+
+    def check_end(self):
+        """ Checks whether any game-end condition has been reached. """
+        if not self.hp or self.score < 0:
+            self.finish(False)
+        elif self.score >= self.victory_points:
+            self.finish(True)
+
+    def finish(self, victory):
+        """ End the game, unless it has already ended. """
+        if self.finished:
+            return
+        self.finished = True
+        self.victory = victory
+        self.score_keeper.finish(victory)
+        for observer in self.observers:
+            observer.game_finished(victory)
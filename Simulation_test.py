@@ -0,0 +1,101 @@
+import sys
+import unittest
+import subprocess
+import Clock
+from Clock import VirtualClock
+from Globals import Attribute as AT
+from Globals import TargetType
+from Simulation import Simulation, SimulationObserver, STARTING_HP, STARTING_TARGETS
+
+class RecordingObserver(SimulationObserver):
+    """ Remember everything the Simulation announced. """
+
+    def __init__(self):
+        self.shown = []
+        self.hidden = []
+        self.scores = []
+        self.finished = []
+
+    def target_added(self, target):
+        self.shown.append(target)
+
+    def target_removed(self, target):
+        self.hidden.append(target)
+
+    def score_changed(self, score, hp):
+        self.scores.append((score, hp))
+
+    def game_finished(self, victory):
+        self.finished.append(victory)
+
+def live_targets(simulation):
+    return [target for target in simulation.factory.targets
+            if target.exists() and target.attributes[AT.TARGET_TYPE] == TargetType.TIMED]
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_clock = Clock.clock
+        self.clock = Clock.install(VirtualClock())
+        self.observer = RecordingObserver()
+        self.simulation = Simulation(observers=[self.observer], seed=1)
+        self.simulation.start()
+
+    def tearDown(self):
+        Clock.install(self.previous_clock)
+
+    # =============================================================
+    # test the rules
+
+    def test_should_start_with_targets(self):
+        self.assertEqual(len(live_targets(self.simulation)), STARTING_TARGETS)
+        self.assertEqual(len(self.observer.shown), STARTING_TARGETS)
+        self.assertEqual(self.observer.scores, [(0, STARTING_HP)])
+
+    def test_should_reward_shot_and_spawn(self):
+        target = live_targets(self.simulation)[0]
+        self.assertIs(self.simulation.shoot(target.attributes[AT.VALUE]), target)
+        self.assertGreater(self.simulation.score, 0)
+        self.assertEqual(self.simulation.score_keeper.targets_shot, 1)
+        self.simulation.update()
+        self.assertIn(target, self.observer.hidden)
+        self.clock.advance(1000)
+        self.assertEqual(len(live_targets(self.simulation)), STARTING_TARGETS)
+
+    def test_should_lose_hp_on_miss_until_defeat(self):
+        for i in range(STARTING_HP):
+            self.assertIsNone(self.simulation.shoot('0'))
+        self.assertEqual(self.simulation.hp, 0)
+        self.assertTrue(self.simulation.finished)
+        self.assertEqual(self.observer.finished, [False])
+        self.assertEqual(self.simulation.score_keeper.misses, STARTING_HP)
+
+    def test_should_penalize_timeouts(self):
+        for i in range(10):
+            self.clock.advance(1000)
+            self.simulation.update()
+        self.assertGreater(self.simulation.score_keeper.targets_timed_out, 0)
+        self.assertEqual(self.observer.finished, [False])
+
+    def test_should_not_import_pygame(self):
+        code = 'import sys, Simulation; sys.exit("pygame" in sys.modules)'
+        self.assertEqual(subprocess.run([sys.executable, '-c', code]).returncode, 0)
+
+# #############################################################
+# SUITES
+
+def suite_rules():
+    suite = unittest.TestSuite()
+    suite.addTest(TestSimulation('test_should_start_with_targets'))
+    suite.addTest(TestSimulation('test_should_reward_shot_and_spawn'))
+    suite.addTest(TestSimulation('test_should_lose_hp_on_miss_until_defeat'))
+    suite.addTest(TestSimulation('test_should_penalize_timeouts'))
+    suite.addTest(TestSimulation('test_should_not_import_pygame'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_rules())
@@ -0,0 +1,129 @@
+""" Provide the rules of the Targets, free of anything to do with drawing them. """
+
+from Clock import get_ticks
+
+from Globals import Trigger as TR
+from Globals import Attribute as AT
+from Globals import ValueStrategy
+from Globals import Attributes
+
+from Triggers import compile_events
+
+# ===================================================================================
+
+class TargetBlueprint:
+    """ Set and pass further the desired events and attributes of a Target. """
+
+    __slots__ = ('events', 'attributes')
+
+    def __init__(self, events={}, attributes={}):
+        """ Set initial values for the instance. """
+        self.events = events.copy()
+        self.attributes = Attributes(attributes)
+        if not AT.VALUE_STRATEGY in self.attributes:
+            self.attributes[AT.VALUE_STRATEGY] = ValueStrategy.PRESET
+
+# ===================================================================================
+
+class TargetRules:
+    """ Provide the behavior every kind of Target shares, whether it is drawn or not. """
+
+    __slots__ = ()
+
+    def setup(self, blueprint):
+        """ Set the values coming from the blueprint. """
+        self.events = compile_events(blueprint.events)
+
+        self.attributes = attr = blueprint.attributes.copy()
+        attr[AT.TIME_CREATED] = get_ticks()
+        attr[AT.GARBAGE] = False
+        if not AT.TIME_TO_BE_SHOWN in attr:
+            attr[AT.TIME_TO_BE_SHOWN] = 0
+
+    def __str__(self):
+        """ Return a string identifying the Target by its value. """
+        return 'Target with value ' + str(self.attributes[AT.VALUE])
+
+    def matches(self, value):
+        """ Check whether the Target's value is equal to the expected. """
+        return value == self.attributes.value
+
+    def exists(self, now=None):
+        """ Check whether the Target is OK to be used. """
+        attr = self.attributes
+        if attr.garbage:
+            return False
+        if attr.time_to_be_shown and (get_ticks() if now is None else now) < attr.time_to_be_shown:
+            return False
+        return True
+
+    def fire_trigger(self, trigger, now=None):
+        """ Process events to happen upon certain trigger being fired; return whether any did. """
+        reaction = self.events.get(trigger)
+        if reaction is None or not self.exists(now):
+            return False
+        reaction(requestor=self)
+        return True
+
+    def calculate_reward(self):
+        """ Return calculated value of this Target's reward. """
+        if AT.REWARD not in self.attributes:
+            return (0, 1)
+        return self.own_value_changer(AT.REWARD).calculate(self)
+
+    def calculate_penalty(self):
+        """ Return calculated value of this Target's penalty. """
+        if AT.PENALTY not in self.attributes:
+            return (0, 1)
+        return self.own_value_changer(AT.PENALTY).calculate(self)
+
+    def own_value_changer(self, attribute):
+        """ Return the ValueChanger under the attribute, copying it first if it is shared. """
+        vc = self.attributes[attribute]
+        if vc.shared:
+            vc = self.attributes[attribute] = vc.copy()
+        return vc
+
+    def calculate_time_percentage_left(self):
+        """ Return a 0-1 value representing the Target's time left. """
+        time_left = self.calculate_time_left()
+        return time_left / self.attributes.time_to_expire
+
+    def calculate_time_left(self):
+        """ Return number of milliseconds the Target has left. """
+        attr = self.attributes
+        time_left = attr.time_created + attr.time_to_expire - get_ticks()
+        if time_left < 0:
+            time_left = 0
+        return time_left
+
+    def update(self):
+        """ React to time passing. """
+        if not self.exists:
+            return
+        if AT.TIME_TO_EXPIRE in self.attributes:
+            if not self.calculate_time_left():
+                self.fire_trigger(TR.TIME_EXPIRED)
+
+# ===================================================================================
+
+class SimTarget(TargetRules):
+    """ Play the part of a Target without ever being drawn, for running the game headlessly. """
+
+    __slots__ = ('events', 'attributes', 'row', 'store', 'value', 'x', 'y')
+
+    def __init__(self, blueprint, font=None):
+        """ Set initial values for the instance based on the blueprint; the font is unused. """
+        self.store = self.row = None
+        self.x = self.y = 0
+        self.reinitialize(blueprint)
+
+    def reinitialize(self, blueprint):
+        """ Make a recycled instance ready to be used again, based on a new blueprint. """
+        self.value = str(blueprint.attributes[AT.VALUE])
+        self.setup(blueprint)
+
+    def set_position(self, x, y):
+        """ Remember where the Target would be drawn. """
+        self.x = x
+        self.y = y
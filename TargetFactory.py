@@ -1,46 +1,90 @@
-import Gui
-import random
 from Globals import Trigger as TR
 from Globals import Action as AC
 from Globals import Attribute as AT
-from Globals import BASIC_FONT, SPACER, ValueChanger, RewardStrategy, PenaltyStrategy, \
-     ANIMATION_LENGTH, STRENGTH_INCREASE
-from Color import Color
-from TargetModule import *
+from Globals import SPACER, RECT_HEIGHT, OrderedSet, ValueChanger, RewardStrategy, PenaltyStrategy, \
+     ValueStrategy, TargetType, ANIMATION_LENGTH, STRENGTH_INCREASE
+from Color import Color, COL
+from TargetCore import TargetBlueprint
+from Trie import Trie
+from Timers import ExpiryQueue
+from RandomPool import RandomPool
+from CodeAllocator import CodeAllocator
+from Board import Board
+from Triggers import TriggerDispatcher, compile_events
+from Clock import get_ticks
 
 def not_implemented_yet(requestor):
     """ Allow for creating actions in the enum before coding their behavior. """
     raise ValueError('Call to an action that was not implemented yet.')
 
-def random_length(length):
-    """ Produce a random integer of a given length. """
-    return str(random.randint((10 ** length) // 9, 10 ** length - 1))
-
-def random_text_color():
-    """ Produce a random color that has a minimum average RGB value and is not too reddish. """
-    minimum_average = 125
-    green = random.randint(0, 255)
-    blue = random.randint(int(minimum_average * 2 - green), 255)
-    current_average = (green + blue) / 2
-    red = random.randint(0, int(max(green, blue) * 0.66))
-    color_array = [red, green, blue]
-    below_min = 3 * minimum_average - sum(color_array)
-    while below_min > 1:
-        color_array = [round(x + min(below_min / 3, 255 - x)) for x in color_array]
-        below_min = 3 * minimum_average - sum(color_array)
-    return Color(rgb=tuple(color_array))
+MAX_STRENGTH = 9
+
+def timed_formulas(strength, reward_scale=1, penalty_scale=1, time_scale=1):
+    """ Calculate the attributes of a timed Target that depend on its strength, optionally scaled. """
+    return {'reward_stiff_value': max(1, 20 * (strength - 3) * (1 + strength/10)) * reward_scale,
+            'reward_base_value': (20 + strength * 10) * reward_scale,
+            'penalty_stiff_value': strength * strength * -1 * penalty_scale,
+            'penalty_base_value': strength * -5 * penalty_scale,
+            'time_to_expire': (strength + 1) * 1500 * time_scale}
+
+def formula_table(reward_scale=1, penalty_scale=1, time_scale=1):
+    """ Evaluate the formulas once for every possible strength. """
+    return [timed_formulas(strength, reward_scale, penalty_scale, time_scale)
+            for strength in range(MAX_STRENGTH + 1)]
+
+TIMED_FORMULAS = formula_table()
 
 class TargetFactory:
     """ Provide the utility necessary for producing new Targets. """
 
-    def __init__(self, functions, after_adder, board_position, board_width, font):
-        """ Initialize necessary values for the factory. """
-        self.targets = []
+    def __init__(self, functions, after_adder, board_position, board_width, font, pool_size=64,
+                 vectorized=False, seed=None, board_height=None, after_remover=None, target_class=None,
+                 strength_increase=STRENGTH_INCREASE, formulas=TIMED_FORMULAS):
+        """ Initialize necessary values for the factory; Targets are drawable unless told otherwise. """
+        if target_class is None:
+            from TargetModule import Target as target_class
+        self.target_class = target_class
+        # the difficulty: how much tougher each spawned Target gets, and the timed Targets' formulas
+        self.strength_increase = strength_increase
+        self.formulas = formulas
+        self.targets = OrderedSet()
+        # despawned Targets waiting to be removed
+        self.garbage = []
+        # removed Targets waiting to be reused, by their types
+        self.pool = {target_type: [] for target_type in TargetType}
+        self.pool_size = pool_size
+        self.pool_counters = {'created': 0, 'reused': 0, 'released': 0, 'discarded': 0}
+        # live, shootable Targets by their values, in the order of creation
+        self.index = {}
+        # the same Targets, by the prefixes of their values
+        self.trie = Trie()
+        # Targets waiting for their time to run out
+        self.expiry = ExpiryQueue()
+        # live Targets by the triggers they react to
+        self.dispatcher = TriggerDispatcher()
+        # optional NumPy columns of the Targets, which then take over the expiry
+        self.store = None
+        if vectorized:
+            from TargetStore import TargetStore
+            self.store = TargetStore()
+        # pre-generated codes and colors
+        self.random = RandomPool(seed)
+        # codes of the live, shootable Targets
+        self.codes = CodeAllocator(self.random)
         self.after_adder = after_adder
+        self.after_remover = after_remover
         self.board_position = board_position
         self.board_width = board_width
+        # rows of Targets below the board position; only those in the viewport are shown
+        self.board = Board(x=board_position[0],
+                           top=board_position[1] + RECT_HEIGHT + SPACER,
+                           row_height=RECT_HEIGHT + SPACER,
+                           height=board_height)
         self.font = font
 
+        # compiled blueprints, by Target types and strengths
+        self.prototypes = {}
+
         self.actions = {}
         for action in AC:
             if action in functions:
@@ -63,126 +107,295 @@ class TargetFactory:
         new_blueprint.attributes[AT.WIDTH] = self.board_width
 
         if new_blueprint.attributes[AT.VALUE_STRATEGY] == ValueStrategy.RANDOM_BY_STRENGTH:
-            new_blueprint.attributes[AT.VALUE] = random_length(int(new_blueprint.attributes[AT.STRENGTH]))
+            new_blueprint.attributes[AT.VALUE] = self.codes.allocate(int(new_blueprint.attributes[AT.STRENGTH]))
+
+        new_target = self.obtain(new_blueprint)
+        visible = self.board.place(new_target)
+
+        self.targets.add(new_target)
+        if new_blueprint.attributes[AT.TARGET_TYPE] != TargetType.DYING_ANIMATION:
+            self.codes.reserve(new_target.attributes[AT.VALUE])
+            self.index.setdefault(new_target.attributes[AT.VALUE], []).append(new_target)
+            self.trie.insert(new_target.attributes[AT.VALUE], new_target)
+        if self.store is not None:
+            self.store.add(new_target)
+        elif AT.TIME_TO_EXPIRE in new_target.attributes:
+            self.expiry.schedule(new_target,
+                                 new_target.attributes[AT.TIME_CREATED] + new_target.attributes[AT.TIME_TO_EXPIRE])
+        self.dispatcher.subscribe(new_target)
+        if visible:
+            self.after_adder(new_target)
+        return new_target
+
+    def expire_due(self):
+        """ Fire the time-expired trigger of the Targets whose time has run out. """
+        now = get_ticks()
+        if self.store is not None:
+            # Whatever has not despawned will simply be found again in the next frame.
+            for target in self.store.expired(now):
+                target.fire_trigger(TR.TIME_EXPIRED, now)
+            return
+        for target in self.expiry.pop_due(now):
+            target.fire_trigger(TR.TIME_EXPIRED, now)
+            if not target.attributes[AT.GARBAGE]:
+                # The Target was not shown yet or has not despawned - check it again later.
+                self.expiry.schedule(target, max(now + 1, target.attributes[AT.TIME_TO_BE_SHOWN]))
+
+    def prepare_draw(self):
+        """ Calculate the draw parameters of all the Targets at once, if the column store is used. """
+        if self.store is not None:
+            board = self.board
+            self.store.prepare_draw(get_ticks(), self.board_width,
+                                    board.x, board.top, board.row_height, board.scroll)
+
+    def scroll(self, rows):
+        """ Scroll the board by the given number of rows, showing and hiding the Targets accordingly. """
+        shown, hidden = self.board.scroll_by(rows)
+        if self.after_remover:
+            for target in hidden:
+                self.after_remover(target)
+        for target in shown:
+            self.after_adder(target)
 
-        new_target = Target(new_blueprint, self.font)
-        add_y = (Gui.GUIRect.HEIGHT + SPACER) * (new_blueprint.attributes[AT.POSITION] + 1)
-        new_target.set_position(x = self.board_position[0],
-                                y = self.board_position[1] + add_y)
+    def broadcast(self, trigger, source=None):
+        """ Fire the trigger on every live Target reacting to it, except for the source. """
+        return self.dispatcher.broadcast(trigger, source)
 
-        self.targets.append(new_target)
-        self.after_adder(new_target)
+    def find(self, value):
+        """ Return the oldest live Target with the given value, or None. """
+        found = self.index.get(value)
+        return found[0] if found else None
+
+    def find_by_prefix(self, prefix):
+        """ Return a view of the live Targets whose values begin with the prefix. """
+        return self.trie.matches(prefix)
+
+    def can_match(self, prefix):
+        """ Check whether any live Target's value begins with the prefix. """
+        return self.trie.find(prefix) is not None
+
+    def despawn(self, target):
+        """ Mark the Target as garbage, which also makes it impossible to shoot. """
+        if target.attributes.garbage:
+            return
+        target.attributes.garbage = True
+        self.unindex(target)
+        self.expiry.cancel(target)
+        self.dispatcher.unsubscribe(target)
+        if self.store is not None:
+            self.store.mark_garbage(target)
+        self.garbage.append(target)
+
+    def collect_garbage(self):
+        """ Remove the despawned Targets and return them. """
+        garbage = self.garbage
+        self.garbage = []
+        for target in garbage:
+            self.targets.discard(target)
+            self.board.remove(target)
+            if self.store is not None:
+                self.store.remove(target)
+            self.release(target)
+        return garbage
+
+    def remove(self, target):
+        """ Forget about a Target altogether. """
+        self.unindex(target)
+        self.expiry.cancel(target)
+        self.dispatcher.unsubscribe(target)
+        self.board.remove(target)
+        if self.store is not None:
+            self.store.remove(target)
+        self.targets.discard(target)
+
+    def unindex(self, target):
+        """ Remove the Target from the index of live Targets. """
+        value = target.attributes[AT.VALUE]
+        found = self.index.get(value)
+        if found and target in found:
+            found.remove(target)
+            if not found:
+                del self.index[value]
+                self.codes.release(value)
+            self.trie.remove(value, target)
        
-    def create_normal(self, blueprint):
-        """ Create a most basic Target. """
-        attr = blueprint.attributes
+    # POOL
+    # =================================================================================
 
-        # WHEN SHOT AT
-        # ===================================================================
-        actions = [self.actions[AC.REWARD],
-                   self.actions[AC.SPAWN],
-                   self.actions[AC.DESPAWN_GOOD]
-                   ]
-        blueprint.events[TR.SHOT_AT] = actions[:]
+    def obtain(self, blueprint):
+        """ Return a recycled Target set up from the blueprint, or a new one if none is free. """
+        free = self.pool[blueprint.attributes[AT.TARGET_TYPE]]
+        if free:
+            target = free.pop()
+            target.reinitialize(blueprint)
+            self.pool_counters['reused'] += 1
+        else:
+            target = self.target_class(blueprint, self.font)
+            self.pool_counters['created'] += 1
+        return target
 
-        # COLOR
+    def release(self, target):
+        """ Put a removed Target in the pool, unless the pool is already full. """
+        free = self.pool[target.attributes[AT.TARGET_TYPE]]
+        if len(free) < self.pool_size:
+            free.append(target)
+            self.pool_counters['released'] += 1
+        else:
+            self.pool_counters['discarded'] += 1
+
+    def pool_stats(self):
+        """ Return a dictionary describing the pool usage. """
+        stats = dict(self.pool_counters)
+        stats['pool_size'] = self.pool_size
+        stats['free'] = {target_type.name: len(free) for target_type, free in self.pool.items()}
+        return stats
+
+    # PROTOTYPES
+    # =================================================================================
+
+    def prototype(self, target_type, strength):
+        """ Return the compiled blueprint shared by all Targets of the type and strength. """
+        key = (target_type, strength)
+        prototype = self.prototypes.get(key)
+        if prototype is None:
+            compiler = {TargetType.NORMAL: self.compile_normal,
+                        TargetType.TIMED: self.compile_timed,
+                        TargetType.DYING_ANIMATION: self.compile_dying_animation
+                        }[target_type]
+            prototype = self.prototypes[key] = compiler(strength)
+            # Every Target of the prototype runs the same single callable per trigger.
+            prototype.events = compile_events(prototype.events)
+        return prototype
+
+    def stamp(self, blueprint, prototype):
+        """ Apply the prototype to the blueprint. The events and ValueChangers stay shared. """
+        blueprint.events.update(prototype.events)
+        blueprint.attributes.update(prototype.attributes)
+        return blueprint.attributes
+
+    def compile_normal(self, strength):
+        """ Compile the prototype of a most basic Target. """
+        prototype = TargetBlueprint()
+        attr = prototype.attributes
+
+        # WHEN SHOT AT
         # ===================================================================
-        text_color = random_text_color()
-        attr[AT.COLORS] = {'frame': text_color,
-                           'bg': Color(rgb=Color.BLACK),
-                           'text': text_color}
+        prototype.events[TR.SHOT_AT] = [self.actions[AC.REWARD],
+                                        self.actions[AC.SPAWN],
+                                        self.actions[AC.DESPAWN_GOOD]
+                                        ]
 
         # INTERACTIONS
         # ===================================================================
         attr[AT.VALUE_STRATEGY] = ValueStrategy.RANDOM_BY_STRENGTH
 
-        vc = ValueChanger()
+        vc = ValueChanger(shared=True)
         vc.strategy = RewardStrategy.HARD_SET
         vc.stiff_value = 10
         vc.base_value = 0
         vc.base_multiplier = 1
         attr[AT.REWARD] = vc
 
-        vc = ValueChanger()
+        vc = ValueChanger(shared=True)
         vc.strategy = PenaltyStrategy.HARD_SET
         vc.stiff_value = -1
         vc.base_value = 0
         vc.base_multiplier = 1
         attr[AT.PENALTY] = vc
 
-        # SPAWN
-        # ===================================================================
-        
-        spawn_blueprint = TargetBlueprint()
-        spawn_attr = spawn_blueprint.attributes
-        spawn_attr[AT.TARGET_TYPE] = TargetType.TIMED
-        spawn_attr[AT.STRENGTH] = 4
-        spawn_attr[AT.POSITION] = attr[AT.POSITION]
-        attr[AT.SPAWN_BLUEPRINT] = spawn_blueprint
-        
-        return blueprint
-    
-    def create_timed(self, blueprint):
-        """ Create a Target that disappears after some time. """
-        attr = blueprint.attributes
+        return prototype
+
+    def compile_timed(self, strength):
+        """ Compile the prototype of a Target that disappears after some time. """
+        prototype = TargetBlueprint()
+        attr = prototype.attributes
+        formulas = self.formulas[strength]
 
         # WHEN SHOT AT
         # ===================================================================
-        actions = [self.actions[AC.REWARD],
-                   self.actions[AC.SPAWN],
-                   self.actions[AC.DESPAWN_GOOD]
-                   ]
-        blueprint.events[TR.SHOT_AT] = actions[:]
+        prototype.events[TR.SHOT_AT] = [self.actions[AC.REWARD],
+                                        self.actions[AC.SPAWN],
+                                        self.actions[AC.DESPAWN_GOOD]
+                                        ]
 
         # WHEN TIMED OUT
         # ===================================================================
-        actions = [self.actions[AC.SPAWN],
-                   self.actions[AC.PENALTY],
-                   self.actions[AC.DESPAWN_BAD]
-                   ]
-        blueprint.events[TR.TIME_EXPIRED] = actions[:]
-
-        # COLOR
-        # ===================================================================
-        attr[AT.COLORS] = {'frame': Color(rgb=Color.WHITE),
-                           'bg': Color(rgb=Color.BLACK),
-                           'text': random_text_color()}
+        prototype.events[TR.TIME_EXPIRED] = [self.actions[AC.SPAWN],
+                                             self.actions[AC.PENALTY],
+                                             self.actions[AC.DESPAWN_BAD]
+                                             ]
 
         # INTERACTIONS
         # ===================================================================
         attr[AT.VALUE_STRATEGY] = ValueStrategy.RANDOM_BY_STRENGTH
         
-        vc = ValueChanger()
+        vc = ValueChanger(shared=True)
         vc.strategy = RewardStrategy.TIME_LEFT
-        strength = int(attr[AT.STRENGTH])
-        vc.stiff_value = max(1, 20 * (strength - 3) * (1 + strength/10))
-        vc.base_value = 20 + strength * 10
+        vc.stiff_value = formulas['reward_stiff_value']
+        vc.base_value = formulas['reward_base_value']
         vc.base_multiplier = 1
         attr[AT.REWARD] = vc
 
-        vc = ValueChanger()
+        vc = ValueChanger(shared=True)
         vc.strategy = PenaltyStrategy.HARD_SET
-        vc.stiff_value = strength * strength * -1
-        vc.base_value = strength * -5
+        vc.stiff_value = formulas['penalty_stiff_value']
+        vc.base_value = formulas['penalty_base_value']
         vc.base_multiplier = 1
         attr[AT.PENALTY] = vc
-        attr[AT.TIME_TO_EXPIRE] = (strength + 1) * 1500
+        attr[AT.TIME_TO_EXPIRE] = formulas['time_to_expire']
+
+        return prototype
+
+    def compile_dying_animation(self, strength):
+        """ Compile the prototype of an animation for another disappearing Target. """
+        prototype = TargetBlueprint()
+        prototype.events[TR.TIME_EXPIRED] = [self.actions[AC.DESPAWN_NONENTITY]]
+        attr = prototype.attributes
+        attr[AT.VALUE_STRATEGY] = ValueStrategy.PRESET
+        attr[AT.TIME_TO_EXPIRE] = ANIMATION_LENGTH
+        return prototype
+
+    # CREATORS
+    # =================================================================================
+
+    def create_normal(self, blueprint):
+        """ Create a most basic Target. """
+        attr = self.stamp(blueprint, self.prototype(TargetType.NORMAL, 0))
+
+        # COLOR
+        # ===================================================================
+        text_color = self.random.text_color()
+        attr[AT.COLORS] = {'frame': text_color,
+                           'bg': COL.BLACK(),
+                           'text': text_color}
 
         # SPAWN
         # ===================================================================
-        spawn_blueprint = TargetBlueprint()
-        spawn_attr = spawn_blueprint.attributes
-        spawn_attr[AT.TARGET_TYPE] = TargetType.TIMED
-        spawn_attr[AT.STRENGTH] = min(attr[AT.STRENGTH] + STRENGTH_INCREASE, 9)
-        spawn_attr[AT.POSITION] = attr[AT.POSITION]
-        attr[AT.SPAWN_BLUEPRINT] = spawn_blueprint
-        
+        attr[AT.SPAWN_BLUEPRINT] = TargetBlueprint(attributes={AT.TARGET_TYPE: TargetType.TIMED,
+                                                               AT.STRENGTH: 4,
+                                                               AT.POSITION: attr[AT.POSITION]})
+        return blueprint
+    
+    def create_timed(self, blueprint):
+        """ Create a Target that disappears after some time. """
+        attr = blueprint.attributes
+        self.stamp(blueprint, self.prototype(TargetType.TIMED, int(attr[AT.STRENGTH])))
+
+        # COLOR
+        # ===================================================================
+        attr[AT.COLORS] = {'frame': COL.WHITE(),
+                           'bg': COL.BLACK(),
+                           'text': self.random.text_color()}
+
+        # SPAWN
+        # ===================================================================
+        spawn_strength = min(attr[AT.STRENGTH] + self.strength_increase, MAX_STRENGTH)
+        attr[AT.SPAWN_BLUEPRINT] = TargetBlueprint(attributes={AT.TARGET_TYPE: TargetType.TIMED,
+                                                               AT.STRENGTH: spawn_strength,
+                                                               AT.POSITION: attr[AT.POSITION]})
         return blueprint
 
     def create_dying_animation(self, blueprint):
         """ Create a Target whose sole purpose is being an animation for another disappearing Target. """
-        blueprint.events[TR.TIME_EXPIRED] = [self.actions[AC.DESPAWN_NONENTITY]]
-        attr = blueprint.attributes
-        attr[AT.VALUE_STRATEGY] = ValueStrategy.PRESET
-        attr[AT.TIME_TO_EXPIRE] = ANIMATION_LENGTH
+        self.stamp(blueprint, self.prototype(TargetType.DYING_ANIMATION, 0))
         return blueprint
@@ -0,0 +1,186 @@
+import unittest
+import pygame
+import Clock
+from Globals import Trigger as TR
+from Globals import Attribute as AT
+from Globals import TargetType
+from TargetModule import TargetBlueprint
+from TargetFactory import TargetFactory
+from Color import COL
+
+def create_factory(vectorized=False):
+    pygame.font.init()
+    added = []
+    factory = TargetFactory(functions={},
+                            after_adder=added.append,
+                            board_position=(0, 0),
+                            board_width=300,
+                            font=pygame.font.Font(None, 48),
+                            vectorized=vectorized)
+    return factory
+
+def create_target(factory, target_type=TargetType.TIMED, value=None, strength=3):
+    blueprint = TargetBlueprint()
+    blueprint.attributes[AT.TARGET_TYPE] = target_type
+    blueprint.attributes[AT.STRENGTH] = strength
+    if value:
+        blueprint.attributes[AT.VALUE] = value
+    if target_type == TargetType.DYING_ANIMATION:
+        blueprint.attributes[AT.COLORS] = {'frame': COL.BLACK(),
+                                           'bg': COL.WHITE(),
+                                           'text': COL.BLACK()}
+    return factory.create(blueprint)
+
+class TestTargetFactory(unittest.TestCase):
+
+    # =============================================================
+    # test the index of live Targets
+
+    def test_should_find_created_target(self):
+        factory = create_factory()
+        target = create_target(factory)
+        self.assertIs(factory.find(target.attributes[AT.VALUE]), target)
+        self.assertIsNone(factory.find('0'))
+
+    def test_should_not_find_despawned_target(self):
+        factory = create_factory()
+        target = create_target(factory)
+        factory.despawn(target)
+        self.assertTrue(target.attributes[AT.GARBAGE])
+        self.assertIsNone(factory.find(target.attributes[AT.VALUE]))
+        self.assertEqual(factory.collect_garbage(), [target])
+        self.assertNotIn(target, factory.targets)
+        self.assertEqual(factory.collect_garbage(), [])
+
+    def test_should_not_find_dying_animation(self):
+        factory = create_factory()
+        create_target(factory, TargetType.DYING_ANIMATION, value='123')
+        self.assertIsNone(factory.find('123'))
+
+    def test_should_find_targets_by_prefix(self):
+        factory = create_factory()
+        target = create_target(factory)
+        value = target.attributes[AT.VALUE]
+        self.assertIn(target, factory.find_by_prefix(value[:2]))
+        self.assertTrue(factory.can_match(value[:1]))
+        factory.despawn(target)
+        self.assertNotIn(target, factory.find_by_prefix(value[:2]))
+        self.assertFalse(factory.can_match(value))
+
+    def test_should_give_live_targets_unique_codes(self):
+        factory = create_factory()
+        targets = [create_target(factory, strength=1) for i in range(9)]
+        self.assertEqual(len({target.attributes[AT.VALUE] for target in targets}), 9)
+        factory.despawn(targets[4])
+        target = create_target(factory, strength=1)
+        self.assertEqual(target.attributes[AT.VALUE], targets[4].attributes[AT.VALUE])
+
+    def test_should_subscribe_live_targets_to_triggers(self):
+        factory = create_factory()
+        target = create_target(factory)
+        self.assertEqual(factory.dispatcher.count(TR.TIME_EXPIRED), 1)
+        self.assertEqual(factory.dispatcher.count(TR.SHOT_MISSED), 0)
+        factory.despawn(target)
+        self.assertEqual(factory.dispatcher.count(TR.TIME_EXPIRED), 0)
+
+    # =============================================================
+    # test the prototypes
+
+    def test_should_share_prototype_until_calculated(self):
+        factory = create_factory()
+        target1 = create_target(factory, strength=5)
+        target2 = create_target(factory, strength=5.6)
+        self.assertIs(target1.events[TR.SHOT_AT], target2.events[TR.SHOT_AT])
+        self.assertIs(target1.attributes[AT.PENALTY], target2.attributes[AT.PENALTY])
+        self.assertEqual(target1.attributes[AT.TIME_TO_EXPIRE], 9000)
+        self.assertEqual(target1.calculate_penalty(), (-50, 1))
+        self.assertIsNot(target1.attributes[AT.PENALTY], target2.attributes[AT.PENALTY])
+        self.assertEqual(target2.attributes[AT.PENALTY].display, '')
+        self.assertEqual(target1.attributes[AT.SPAWN_BLUEPRINT].attributes[AT.STRENGTH], 5.3)
+
+    # =============================================================
+    # test the pool
+
+    def test_should_reuse_collected_target(self):
+        factory = create_factory()
+        target = create_target(factory)
+        factory.despawn(target)
+        factory.collect_garbage()
+        self.assertEqual(factory.pool_stats()['free']['TIMED'], 1)
+        reused = create_target(factory, value='4321')
+        self.assertIs(reused, target)
+        self.assertFalse(reused.attributes[AT.GARBAGE])
+        self.assertIs(factory.find(reused.attributes[AT.VALUE]), reused)
+        self.assertEqual(factory.pool_stats()['reused'], 1)
+
+    def test_should_not_pool_more_than_pool_size(self):
+        factory = create_factory()
+        factory.pool_size = 1
+        for target in [create_target(factory), create_target(factory)]:
+            factory.despawn(target)
+        factory.collect_garbage()
+        stats = factory.pool_stats()
+        self.assertEqual((stats['released'], stats['discarded']), (1, 1))
+
+    # =============================================================
+    # test the column store
+
+    def test_should_draw_timers_from_column_store(self):
+        previous_clock = Clock.clock
+        clock = Clock.install(Clock.VirtualClock())
+        try:
+            factory = create_factory(vectorized=True)
+            target = create_target(factory)
+            self.assertIs(target.store, factory.store)
+            clock.advance(1000)
+            expected = int(target.width * target.calculate_time_percentage_left())
+            board = factory.board
+            factory.prepare_draw()
+            self.assertEqual(factory.store.widths[target.row], expected)
+            self.assertEqual(target.prepared()[0], expected)
+            self.assertEqual((target.x, target.y),
+                             (board.x, board.top + target.attributes.position * board.row_height))
+            factory.despawn(target)
+            factory.collect_garbage()
+            self.assertIsNone(target.store)
+        finally:
+            Clock.install(previous_clock)
+
+# #############################################################
+# SUITES
+
+def suite_index():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTargetFactory('test_should_find_created_target'))
+    suite.addTest(TestTargetFactory('test_should_not_find_despawned_target'))
+    suite.addTest(TestTargetFactory('test_should_not_find_dying_animation'))
+    suite.addTest(TestTargetFactory('test_should_find_targets_by_prefix'))
+    suite.addTest(TestTargetFactory('test_should_give_live_targets_unique_codes'))
+    suite.addTest(TestTargetFactory('test_should_subscribe_live_targets_to_triggers'))
+    return suite
+
+def suite_prototypes():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTargetFactory('test_should_share_prototype_until_calculated'))
+    return suite
+
+def suite_pool():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTargetFactory('test_should_reuse_collected_target'))
+    suite.addTest(TestTargetFactory('test_should_not_pool_more_than_pool_size'))
+    return suite
+
+def suite_store():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTargetFactory('test_should_draw_timers_from_column_store'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_index())
+    runner.run(suite_prototypes())
+    runner.run(suite_pool())
+    runner.run(suite_store())
@@ -1,36 +1,24 @@
 import pygame
-from pygame.time import get_ticks
+
+from Clock import get_ticks
 
 from Globals import Trigger as TR
 from Globals import Action as AC
 from Globals import Attribute as AT
 from Globals import ValueStrategy
 from Globals import TargetType
-from Globals import BG_COLOR
-
-import random
-
-from Color import Color
+from Globals import BLENDER
 
 import Gui
+from TargetCore import TargetBlueprint, TargetRules
 
 # ===================================================================================
 
-class TargetBlueprint:
-    """ Set and pass further the desired events and attributes of a Target. """
-
-    def __init__(self, events={}, attributes={}):
-        """ Set initial values for the instance. """
-        self.events = events.copy()
-        self.attributes = attributes.copy()
-        if not AT.VALUE_STRATEGY in self.attributes:
-            self.attributes[AT.VALUE_STRATEGY] = ValueStrategy.PRESET
-
-# ===================================================================================
-
-class Target(Gui.GUIRectWithText):
+class Target(TargetRules, Gui.GUIRectWithText):
     """ Display a target for the player to destroy by typing. """
 
+    __slots__ = ('events', 'attributes', 'timer_sprites', 'row', 'store')
+
     def __init__(self, blueprint, font):
         """ Set initial values for the instance based on the blueprint. """
         BA = blueprint.attributes
@@ -40,109 +28,120 @@ class Target(Gui.GUIRectWithText):
                                    align='cc')
         super().__init__(width=BA[AT.WIDTH],
                          text=text)
-
-        self.events = blueprint.events.copy()
-        
-        self.attributes = attr = BA.copy()
-        attr[AT.TIME_CREATED] = get_ticks()
-        attr[AT.GARBAGE] = False
-        if not AT.TIME_TO_BE_SHOWN in attr:
-            attr[AT.TIME_TO_BE_SHOWN] = 0
+        self.timer_sprites = {}
+        # the TargetFactory's column store, if it uses one, and the row in it
+        self.store = None
+        self.row = None
+        self.setup(blueprint)
+
+    def reinitialize(self, blueprint):
+        """ Make a recycled instance ready to be used again, based on a new blueprint. """
+        BA = blueprint.attributes
+        self.text.value = self.value = str(BA[AT.VALUE])
+        self.text.color = BA[AT.COLORS]['text']
+        self.width = BA[AT.WIDTH]
+        self.frame_width = 3
+        self.setup(blueprint)
+
+    def setup(self, blueprint):
+        """ Set the values coming from the blueprint. """
+        super().setup(blueprint)
+        attr = self.attributes
         if AT.FRAME_WIDTH in attr:
             self.frame_width = attr[AT.FRAME_WIDTH]
         self.colors = self.attributes[AT.COLORS]
 
-    def __str__(self):
-        """ Return a string identifying the Target by its value. """
-        return 'Target with value ' + str(self.attributes[AT.VALUE])
-
-    def matches(self, value):
-        """ Check whether the Target's value is equal to the expected. """
-        return value == self.attributes[AT.VALUE]
-
-    def exists(self):
-        """ Check whether the Target is OK to be used. """
-        if self.attributes[AT.GARBAGE]:
-            return False
-        if get_ticks() < self.attributes[AT.TIME_TO_BE_SHOWN]:
-            return False
-        return True
-
-    def fire_trigger(self, trigger):
-        """ Process events to happen upon certain trigger being fired. """
-        if not self.exists():
-            return
-        if trigger in self.events:
-            for action in self.events[trigger]:
-                action(requestor=self)
-
-    def calculate_reward(self):
-        """ Return calculated value of this Target's reward. """
-        if AT.REWARD not in self.attributes:
-            return (0, 1)
-        return self.attributes[AT.REWARD].calculate(self)
-
-    def calculate_penalty(self):
-        """ Return calculated value of this Target's penalty. """
-        if AT.PENALTY not in self.attributes:
-            return (0, 1)
-        return self.attributes[AT.PENALTY].calculate(self)
-
-    def calculate_time_percentage_left(self):
-        """ Return a 0-1 value representing the Target's time left. """
-        time_left = self.calculate_time_left()
-        return time_left / self.attributes[AT.TIME_TO_EXPIRE]
-
-    def calculate_time_left(self):
-        """ Return number of milliseconds the Target has left. """
-        time_left = self.attributes[AT.TIME_CREATED] \
-                    + self.attributes[AT.TIME_TO_EXPIRE] \
-                    - get_ticks()
-        if time_left < 0:
-            time_left = 0
-        return time_left
-
-    def update(self):
-        """ React to time passing. """
-        if not self.exists:
-            return
-        if AT.TIME_TO_EXPIRE in self.attributes:
-            if not self.calculate_time_left():
-                self.fire_trigger(TR.TIME_EXPIRED)
+        # Render the timer frame layers up front, for the opacity they are usually shown with.
+        spare_sprites = self.timer_sprites
+        self.timer_sprites = {}
+        if attr[AT.TARGET_TYPE] == TargetType.TIMED:
+            opacity = self.text.opacity / 2 + 0.5
+            self.create_timer_sprites(opacity, spare_sprites.get(opacity))
+
+    def draw_state(self):
+        """ Get a value describing everything that affects the drawing of the instance. """
+        parameters = self.prepared()
+        state = super().draw_state()
+        if self.attributes.target_type == TargetType.TIMED:
+            return (state, parameters[0] if parameters else self.calculate_width_left())
+        return state
 
     def draw(self):
         """ Draw the instance on the screen. """
         if not self.exists:
             return
-        if self.attributes[AT.TARGET_TYPE] == TargetType.TIMED:
-            self.draw_frame_timed(self.text.opacity / 2 + 0.5)
+        parameters = self.prepared()
+        if self.attributes.target_type == TargetType.TIMED:
+            if parameters:
+                self.draw_frame_timed(parameters[3], parameters[0])
+            else:
+                self.draw_frame_timed(self.text.opacity / 2 + 0.5)
         else:
-            self.draw_frame(0.5)
+            self.draw_frame(parameters[3] if parameters else 0.5)
         self.text.draw()
 
-    def draw_frame_timed(self, opacity):
-        """ Draw a frame that shows how much time has elapsed. """
-        percent_left = self.calculate_time_percentage_left()
-        width_left = self.width * percent_left
-        width_gone = self.width - width_left - 1
-            
-        if percent_left:
-            pygame.draw.rect(window_surface,
-                             self.colors['text'].apply_opacity(BG_COLOR, opacity).to_tuple(),
-                             (self.x, self.y, width_left, self.height)
-                             )
-        opacity_gone = 0.2 + opacity/5
-        pygame.draw.rect(window_surface,
-                         self.colors['frame'].apply_opacity(BG_COLOR, opacity_gone).to_tuple(),
-                         (self.x + width_left + 1, self.y, width_gone, self.height)
-                         )
-            
-        if percent_left:
-            pygame.draw.rect(window_surface,
-                             self.colors['text'].apply_opacity(BG_COLOR, 0.15).to_tuple(),
-                             (self.x+3, self.y+3, width_left-3, self.height-6)
-                             )
-        pygame.draw.rect(window_surface,
+    def prepared(self):
+        """
+        Return the draw parameters the column store calculated for this frame, if there are any.
+
+        The instance is moved to the position found in them first - the board leaves the
+        Targets with a row where they were when it scrolls.
+        """
+        if self.store is None:
+            return None
+        parameters = self.store.draw_parameters(self.row, get_ticks())
+        if parameters is not None:
+            x, y = parameters[1:3]
+            if x != self.x or y != self.y:
+                self.set_position(x, y)
+        return parameters
+
+    def calculate_width_left(self):
+        """ Return the whole number of pixels of the timer bar that are left. """
+        return int(self.width * self.calculate_time_percentage_left())
+
+    def create_timer_sprites(self, opacity, spare_sprites=None):
+        """ Render the filled and the drained layers of the timer frame for given opacity. """
+        size = pygame.Rect(0, 0, self.width, self.height).size
+        recycled = spare_sprites is not None and spare_sprites[0].get_size() == size
+        if recycled:
+            # Draw over the surfaces of a recycled instance instead of creating new ones.
+            filled, drained = spare_sprites
+        else:
+            filled = pygame.Surface(size)
+            drained = pygame.Surface(size)
+
+        pygame.draw.rect(filled,
+                         BLENDER.blend(self.colors['text'], opacity),
+                         (0, 0, self.width, self.height))
+        pygame.draw.rect(filled,
+                         BLENDER.blend(self.colors['text'], 0.15),
+                         (3, 3, self.width - 3, self.height - 6))
+
+        pygame.draw.rect(drained,
+                         BLENDER.blend(self.colors['frame'], 0.2 + opacity/5),
+                         (0, 0, self.width, self.height))
+        pygame.draw.rect(drained,
                          self.colors['bg'].to_tuple(),
-                         (self.x + width_left + 1, self.y + 3, width_gone - 3, self.height - 6)
-                         )
+                         (0, 3, self.width - 3, self.height - 6))
+
+        if pygame.display.get_surface() and not recycled:
+            filled = filled.convert()
+            drained = drained.convert()
+        self.timer_sprites[opacity] = sprites = (filled, drained)
+        return sprites
+
+    def draw_frame_timed(self, opacity, width_left=None):
+        """ Draw a frame that shows how much time has elapsed, using the pre-rendered layers. """
+        sprites = self.timer_sprites.get(opacity)
+        if not sprites:
+            sprites = self.create_timer_sprites(opacity)
+        filled, drained = sprites
+        if width_left is None:
+            width_left = self.calculate_width_left()
+
+        if width_left:
+            window_surface.blit(filled, (self.x, self.y), (0, 0, width_left, self.height))
+        window_surface.blit(drained,
+                            (self.x + width_left + 1, self.y),
+                            (width_left + 1, 0, drained.get_width() - width_left - 1, self.height))
@@ -0,0 +1,171 @@
+""" Provide a NumPy structure-of-arrays mirror of the Targets for batch operations. """
+
+import numpy as np
+
+from Globals import Attribute as AT
+from Globals import TargetType
+
+COLUMNS = ('created', 'expire', 'strength', 'position', 'state', 'value', 'timed', 'opacity')
+
+# row states
+FREE = 0
+LIVE = 1
+GARBAGE = 2
+
+class TargetStore:
+    """
+    Keep the numeric attributes of the Targets in columns, one row per Target.
+
+    Once per frame, the draw parameters of every row - the timer bar width, the position
+    on the screen and the frame opacity - are calculated in a few array operations;
+    a Target with a row draws with those instead of calculating its own. The expired
+    Targets are found in the columns, too.
+
+    The Targets' attributes stay the source of truth for the game rules, which read them
+    in many places; the columns mirror them and are not written back. The strength and
+    the value are mirrored for batch queries over the live Targets - the game's own
+    lookups by value go through the factory's index and trie, which answer in constant time.
+    """
+
+    def __init__(self, capacity=64):
+        """ Allocate the columns. """
+        self.capacity = 0
+        self.created = np.zeros(0, dtype=np.int64)
+        self.expire = np.zeros(0, dtype=np.int64)
+        self.strength = np.zeros(0, dtype=np.float32)
+        self.position = np.zeros(0, dtype=np.int32)
+        self.state = np.zeros(0, dtype=np.int8)
+        self.value = np.zeros(0, dtype=np.int64)
+        # whether the Target shows a timer, and the opacity of its text
+        self.timed = np.zeros(0, dtype=np.bool_)
+        self.opacity = np.zeros(0, dtype=np.float64)
+        self.targets = []
+        self.free_rows = []
+        # the draw parameters of every row, and the time they were calculated for
+        self.widths = []
+        self.ys = []
+        self.opacities = []
+        self.x = 0
+        self.prepared_at = None
+        self.grow(capacity)
+
+    def live_count(self):
+        """ Return the number of rows taken by Targets. """
+        # Not __len__ - an empty store would then be false, like a missing one.
+        return self.capacity - len(self.free_rows)
+
+    def grow(self, capacity):
+        """ Make room for at least the given number of rows. """
+        if capacity <= self.capacity:
+            return
+        extra = capacity - self.capacity
+        for name in COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate((column, np.zeros(extra, dtype=column.dtype))))
+        self.targets.extend([None] * extra)
+        # Hand out the lowest rows first.
+        self.free_rows.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.free_rows.sort(reverse=True)
+        self.capacity = capacity
+
+    def add(self, target):
+        """ Give the Target a row and fill it with the Target's attributes. """
+        if not self.free_rows:
+            self.grow(max(1, self.capacity * 2))
+        row = self.free_rows.pop()
+        attr = target.attributes
+        value = str(attr[AT.VALUE])
+        self.created[row] = attr[AT.TIME_CREATED]
+        self.expire[row] = attr.get(AT.TIME_TO_EXPIRE, 0)
+        self.strength[row] = attr.get(AT.STRENGTH, 0)
+        self.position[row] = attr.get(AT.POSITION, 0)
+        self.state[row] = GARBAGE if attr[AT.GARBAGE] else LIVE
+        self.value[row] = int(value) if value.isdigit() else -1
+        self.timed[row] = attr.get(AT.TARGET_TYPE) == TargetType.TIMED
+        self.opacity[row] = 1
+        self.targets[row] = target
+        target.row = row
+        target.store = self
+        # The draw parameters calculated so far do not cover the new row.
+        self.prepared_at = None
+        return row
+
+    def set_opacity(self, target, opacity):
+        """ Change the opacity of the Target's text, which the opacity of its frame follows. """
+        self.opacity[target.row] = opacity
+        self.prepared_at = None
+
+    def mark_garbage(self, target):
+        """ Mark the row of a despawned Target. """
+        if target.row is not None:
+            self.state[target.row] = GARBAGE
+
+    def remove(self, target):
+        """ Free the row of a removed Target. """
+        row = target.row
+        if row is None:
+            return
+        self.state[row] = FREE
+        self.targets[row] = None
+        self.free_rows.append(row)
+        target.row = None
+        target.store = None
+
+    # =============================================================
+    # batch operations
+
+    def time_left(self, now):
+        """ Return the milliseconds left for every row; 0 for rows without expiry. """
+        left = self.created + self.expire - now
+        np.maximum(left, 0, out=left)
+        left[self.expire == 0] = 0
+        return left
+
+    def expired_rows(self, now):
+        """ Return the indices of the live rows whose time has run out. """
+        due = (self.state == LIVE) & (self.expire > 0) & (self.created + self.expire <= now)
+        return np.flatnonzero(due)
+
+    def expired(self, now):
+        """ Return the live Targets whose time has run out, in the order of rows. """
+        targets = self.targets
+        return [targets[row] for row in self.expired_rows(now).tolist()]
+
+    def timer_widths(self, now, width):
+        """ Return the whole number of timer bar pixels left for every row with expiry. """
+        live = self.expire > 0
+        widths = np.zeros(self.capacity, dtype=np.int64)
+        # Divide first, like the Targets do, to come up with the very same pixels.
+        widths[live] = (width * (self.time_left(now)[live] / self.expire[live])).astype(np.int64)
+        return widths
+
+    def frame_opacities(self):
+        """ Return the opacity of the frame of every row: a timer follows its text, the rest are at half. """
+        return np.where(self.timed, self.opacity / 2 + 0.5, 0.5)
+
+    def live_rows(self):
+        """ Return the indices of the live rows. """
+        return np.flatnonzero(self.state == LIVE)
+
+    def rows_with_value(self, value):
+        """ Return the indices of the live rows of the given value. """
+        return np.flatnonzero((self.state == LIVE) & (self.value == int(value)))
+
+    def prepare_draw(self, now, width, x, top, row_height, scroll):
+        """
+        Calculate the draw parameters of all the rows for the frame drawn at the given time.
+
+        The Targets are laid out like the board does it: at x, in the rows below the top,
+        scrolled by the given number of rows.
+        """
+        self.widths = self.timer_widths(now, width).tolist()
+        self.ys = (top + (self.position - scroll) * row_height).tolist()
+        self.opacities = self.frame_opacities().tolist()
+        self.x = x
+        self.prepared_at = now
+
+    def draw_parameters(self, row, now):
+        """ Return the timer bar width, x, y and frame opacity of the row prepared for the time, or None. """
+        if self.prepared_at != now:
+            return None
+        return self.widths[row], self.x, self.ys[row], self.opacities[row]
@@ -0,0 +1,105 @@
+import unittest
+from Globals import Attribute as AT
+from Globals import TargetType
+from TargetStore import TargetStore, GARBAGE, FREE
+
+class FakeTarget:
+    """ Hold only the attributes the store reads. """
+
+    def __init__(self, value, created, expire=None, position=0):
+        self.row = self.store = None
+        self.attributes = {AT.VALUE: value,
+                           AT.TIME_CREATED: created,
+                           AT.GARBAGE: False,
+                           AT.STRENGTH: 3,
+                           AT.POSITION: position,
+                           AT.TARGET_TYPE: TargetType.TIMED if expire else TargetType.NORMAL}
+        if expire:
+            self.attributes[AT.TIME_TO_EXPIRE] = expire
+
+class TestTargetStore(unittest.TestCase):
+
+    # =============================================================
+    # test rows
+
+    def test_should_grow_and_reuse_rows(self):
+        store = TargetStore(capacity=1)
+        targets = [FakeTarget('1', 0), FakeTarget('2', 0), FakeTarget('3', 0)]
+        for target in targets:
+            store.add(target)
+        self.assertEqual([target.row for target in targets], [0, 1, 2])
+        store.remove(targets[1])
+        self.assertEqual(store.state[1], FREE)
+        self.assertEqual(store.add(FakeTarget('4', 0)), 1)
+        self.assertEqual(store.live_count(), 3)
+        self.assertTrue(TargetStore(capacity=0))
+
+    # =============================================================
+    # test batch operations
+
+    def test_should_find_expired_live_targets(self):
+        store = TargetStore()
+        due = FakeTarget('1', 0, 100)
+        late = FakeTarget('2', 0, 500)
+        endless = FakeTarget('3', 0)
+        dead = FakeTarget('4', 0, 100)
+        for target in (due, late, endless, dead):
+            store.add(target)
+        store.mark_garbage(dead)
+        self.assertEqual(store.state[dead.row], GARBAGE)
+        self.assertEqual(store.expired(200), [due])
+        self.assertEqual(store.time_left(200)[:3].tolist(), [0, 300, 0])
+
+    def test_should_calculate_timer_widths(self):
+        store = TargetStore()
+        store.add(FakeTarget('1', 0, 1000))
+        store.add(FakeTarget('2', 500, 1000))
+        self.assertEqual(store.timer_widths(750, 100)[:2].tolist(), [25, 75])
+
+    def test_should_prepare_draw_parameters(self):
+        store = TargetStore()
+        timed = FakeTarget('1', 0, 1000, position=3)
+        normal = FakeTarget('22', 0, position=1)
+        for target in (timed, normal):
+            store.add(target)
+        store.set_opacity(timed, 0.5)
+        store.prepare_draw(250, 100, x=5, top=10, row_height=50, scroll=1)
+        self.assertEqual(store.draw_parameters(timed.row, 250), (75, 5, 110, 0.75))
+        self.assertEqual(store.draw_parameters(normal.row, 250), (0, 5, 10, 0.5))
+        self.assertIsNone(store.draw_parameters(timed.row, 260))
+        store.add(FakeTarget('3', 250, 1000))
+        self.assertIsNone(store.draw_parameters(timed.row, 250))
+
+    def test_should_query_live_values(self):
+        store = TargetStore()
+        targets = [FakeTarget('12', 0), FakeTarget('34', 0), FakeTarget('12', 0)]
+        for target in targets:
+            store.add(target)
+        store.mark_garbage(targets[0])
+        self.assertEqual(store.rows_with_value('12').tolist(), [targets[2].row])
+        self.assertEqual(store.live_rows().tolist(), [1, 2])
+        self.assertEqual(store.strength[store.live_rows()].tolist(), [3, 3])
+
+# #############################################################
+# SUITES
+
+def suite_rows():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTargetStore('test_should_grow_and_reuse_rows'))
+    return suite
+
+def suite_batch():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTargetStore('test_should_find_expired_live_targets'))
+    suite.addTest(TestTargetStore('test_should_calculate_timer_widths'))
+    suite.addTest(TestTargetStore('test_should_prepare_draw_parameters'))
+    suite.addTest(TestTargetStore('test_should_query_live_values'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_rows())
+    runner.run(suite_batch())
@@ -0,0 +1,66 @@
+""" Provide a queue of items waiting for their time to expire. """
+
+import heapq
+import itertools
+
+class ExpiryQueue:
+    """ Hand out the items whose expiry time has come, without looking at the others. """
+
+    def __init__(self):
+        """ Initialize the heap and the map of scheduled items. """
+        self.heap = []
+        self.entries = {}
+        self.counter = itertools.count()
+        self.blanks = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def schedule(self, item, due):
+        """ Make the item expire at the given time, replacing its previous time if any. """
+        self.cancel(item)
+        # The counter keeps the order of scheduling among equal times and avoids comparing items.
+        entry = [due, next(self.counter), item]
+        self.entries[item] = entry
+        heapq.heappush(self.heap, entry)
+
+    def cancel(self, item):
+        """ Make the item never expire; do nothing if it is not scheduled. """
+        entry = self.entries.pop(item, None)
+        if entry:
+            # Removing from the middle of the heap is costly - leave a blank to skip later.
+            entry[2] = None
+            self.blanks += 1
+            if self.blanks > 64 and self.blanks * 2 > len(self.heap):
+                self.compact()
+
+    def compact(self):
+        """ Get rid of the blanks left by the cancelled items. """
+        self.heap = [entry for entry in self.heap if entry[2] is not None]
+        heapq.heapify(self.heap)
+        self.blanks = 0
+
+    def next_due(self):
+        """ Return the earliest expiry time, or None if nothing is scheduled. """
+        heap = self.heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+            self.blanks -= 1
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now):
+        """ Remove and return the items whose expiry time is not later than now. """
+        heap = self.heap
+        due = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            item = entry[2]
+            if item is None:
+                self.blanks -= 1
+            else:
+                del self.entries[item]
+                due.append(item)
+        return due
@@ -0,0 +1,69 @@
+import unittest
+from Timers import ExpiryQueue
+
+class TestExpiryQueue(unittest.TestCase):
+
+    # =============================================================
+    # test expiring
+
+    def test_should_pop_only_due_items_in_order(self):
+        queue = ExpiryQueue()
+        queue.schedule('late', 300)
+        queue.schedule('early', 100)
+        queue.schedule('middle', 200)
+        self.assertEqual(queue.pop_due(50), [])
+        self.assertEqual(queue.pop_due(200), ['early', 'middle'])
+        self.assertEqual(queue.next_due(), 300)
+        self.assertEqual(len(queue), 1)
+
+    def test_should_reschedule_item(self):
+        queue = ExpiryQueue()
+        queue.schedule('a', 100)
+        queue.schedule('a', 500)
+        self.assertEqual(queue.pop_due(100), [])
+        self.assertEqual(queue.pop_due(500), ['a'])
+
+    # =============================================================
+    # test cancelling
+
+    def test_should_not_pop_cancelled_item(self):
+        queue = ExpiryQueue()
+        queue.schedule('a', 100)
+        queue.schedule('b', 100)
+        queue.cancel('a')
+        queue.cancel('c')
+        self.assertNotIn('a', queue)
+        self.assertEqual(queue.pop_due(100), ['b'])
+        self.assertIsNone(queue.next_due())
+
+    def test_should_compact_after_many_cancellations(self):
+        queue = ExpiryQueue()
+        for item in range(200):
+            queue.schedule(item, item)
+        for item in range(150):
+            queue.cancel(item)
+        self.assertLess(len(queue.heap), 200)
+        self.assertEqual(queue.pop_due(1000), list(range(150, 200)))
+
+# #############################################################
+# SUITES
+
+def suite_expiring():
+    suite = unittest.TestSuite()
+    suite.addTest(TestExpiryQueue('test_should_pop_only_due_items_in_order'))
+    suite.addTest(TestExpiryQueue('test_should_reschedule_item'))
+    return suite
+
+def suite_cancelling():
+    suite = unittest.TestSuite()
+    suite.addTest(TestExpiryQueue('test_should_not_pop_cancelled_item'))
+    suite.addTest(TestExpiryQueue('test_should_compact_after_many_cancellations'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_expiring())
+    runner.run(suite_cancelling())
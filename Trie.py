@@ -0,0 +1,70 @@
+""" Provide a prefix tree for finding the values which begin with the typed-in digits. """
+
+class TrieNode:
+    """ Hold the children of a single prefix and the items stored under it. """
+
+    __slots__ = ('children', 'items')
+
+    def __init__(self):
+        """ Initialize the variables of the node. """
+        self.children = {}
+        # items under this prefix, in the order of insertion (the values are unused)
+        self.items = {}
+
+class Trie:
+    """ Store items under string keys and find them by any prefix of the key. """
+
+    def __init__(self):
+        """ Initialize the root of the tree. """
+        self.root = TrieNode()
+
+    def __len__(self):
+        return len(self.root.items)
+
+    def insert(self, key, item):
+        """ Store the item under the key. """
+        node = self.root
+        node.items[item] = None
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+            node = child
+            node.items[item] = None
+
+    def remove(self, key, item):
+        """ Remove the item stored under the key; do nothing if it is not there. """
+        node = self.root
+        if item not in node.items:
+            return
+        path = [node]
+        for char in key:
+            node = node.children.get(char)
+            if node is None or item not in node.items:
+                return
+            path.append(node)
+        for depth, node in enumerate(path):
+            del node.items[item]
+            if depth and not node.items:
+                # Nothing else is stored below - cut off the whole branch.
+                del path[depth - 1].children[key[depth - 1]]
+                break
+
+    def find(self, prefix):
+        """ Return the node of the prefix, or None if nothing begins with it. """
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def matches(self, prefix):
+        """ Return a view of the items whose keys begin with the prefix. """
+        node = self.find(prefix)
+        return node.items.keys() if node else {}.keys()
+
+    def count(self, prefix):
+        """ Return the number of items whose keys begin with the prefix. """
+        node = self.find(prefix)
+        return len(node.items) if node else 0
@@ -0,0 +1,69 @@
+import unittest
+from Trie import Trie
+
+class TestTrie(unittest.TestCase):
+
+    # =============================================================
+    # test finding
+
+    def test_should_match_by_prefix(self):
+        trie = Trie()
+        trie.insert('123', 'a')
+        trie.insert('129', 'b')
+        trie.insert('456', 'c')
+        self.assertEqual(list(trie.matches('12')), ['a', 'b'])
+        self.assertEqual(list(trie.matches('123')), ['a'])
+        self.assertEqual(list(trie.matches('')), ['a', 'b', 'c'])
+        self.assertEqual(trie.count('7'), 0)
+        self.assertEqual(len(trie), 3)
+
+    def test_should_hold_items_with_same_key(self):
+        trie = Trie()
+        trie.insert('12', 'a')
+        trie.insert('12', 'b')
+        self.assertEqual(trie.count('12'), 2)
+
+    # =============================================================
+    # test removing
+
+    def test_should_remove_item(self):
+        trie = Trie()
+        trie.insert('123', 'a')
+        trie.insert('129', 'b')
+        trie.remove('123', 'a')
+        self.assertEqual(list(trie.matches('1')), ['b'])
+        self.assertEqual(trie.count('123'), 0)
+        self.assertNotIn('3', trie.find('12').children)
+
+    def test_should_ignore_removing_missing_item(self):
+        trie = Trie()
+        trie.insert('123', 'a')
+        trie.remove('124', 'a')
+        trie.remove('123', 'b')
+        self.assertEqual(trie.count('123'), 1)
+        trie.remove('123', 'a')
+        self.assertEqual(len(trie), 0)
+        self.assertEqual(trie.root.children, {})
+
+# #############################################################
+# SUITES
+
+def suite_finding():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTrie('test_should_match_by_prefix'))
+    suite.addTest(TestTrie('test_should_hold_items_with_same_key'))
+    return suite
+
+def suite_removing():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTrie('test_should_remove_item'))
+    suite.addTest(TestTrie('test_should_ignore_removing_missing_item'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_finding())
+    runner.run(suite_removing())
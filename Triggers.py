@@ -0,0 +1,64 @@
+""" Provide the compiled reactions of the Targets and an index of who listens to which trigger. """
+
+from Clock import get_ticks
+
+from Globals import OrderedSet
+
+def compile_actions(actions):
+    """ Turn a list of actions into a single callable running all of them in order. """
+    if callable(actions):
+        return actions
+    actions = tuple(actions)
+    if len(actions) == 1:
+        return actions[0]
+
+    def run_actions(requestor):
+        for action in actions:
+            action(requestor=requestor)
+    run_actions.actions = actions
+    return run_actions
+
+def compile_events(events):
+    """ Return a copy of the events with every list of actions compiled; compiled ones are kept. """
+    return {trigger: compile_actions(actions) for trigger, actions in events.items() if actions}
+
+class TriggerDispatcher:
+    """ Index the Targets by the triggers they react to, so that broadcasts only visit those. """
+
+    def __init__(self):
+        """ Initialize the index of subscribers. """
+        # subscribed Targets by triggers, in the order of subscribing
+        self.subscribers = {}
+
+    def subscribe(self, target):
+        """ Make the Target receive the broadcasts of every trigger it has a reaction for. """
+        for trigger in target.events:
+            subscribers = self.subscribers.get(trigger)
+            if subscribers is None:
+                subscribers = self.subscribers[trigger] = OrderedSet()
+            subscribers.add(target)
+
+    def unsubscribe(self, target):
+        """ Stop sending broadcasts to the Target; do nothing if it is not subscribed. """
+        for trigger in target.events:
+            subscribers = self.subscribers.get(trigger)
+            if subscribers is not None:
+                subscribers.discard(target)
+
+    def count(self, trigger):
+        """ Return the number of Targets reacting to the trigger. """
+        subscribers = self.subscribers.get(trigger)
+        return len(subscribers) if subscribers else 0
+
+    def broadcast(self, trigger, source=None):
+        """ Fire the trigger on every subscribed Target but the source; return the number of those fired. """
+        subscribers = self.subscribers.get(trigger)
+        if not subscribers:
+            return 0
+        now = get_ticks()
+        fired = 0
+        # The reactions may (un)subscribe Targets - iterate over a snapshot.
+        for target in list(subscribers):
+            if target is not source and target.fire_trigger(trigger, now):
+                fired += 1
+        return fired
@@ -0,0 +1,101 @@
+import unittest
+from Globals import Trigger as TR
+from Triggers import TriggerDispatcher, compile_actions, compile_events
+
+class FakeTarget:
+    """ Stand in for a Target, recording the triggers fired on it. """
+
+    def __init__(self, events, exists=True):
+        self.events = compile_events(events)
+        self.alive = exists
+        self.fired = []
+
+    def fire_trigger(self, trigger, now=None):
+        if not self.alive:
+            return False
+        self.fired.append(trigger)
+        self.events[trigger](requestor=self)
+        return True
+
+class TestTriggers(unittest.TestCase):
+
+    # =============================================================
+    # test compiling
+
+    def test_should_run_compiled_actions_in_order(self):
+        calls = []
+        first = lambda requestor: calls.append(('first', requestor))
+        second = lambda requestor: calls.append(('second', requestor))
+        compile_actions([first, second])(requestor='target')
+        self.assertEqual(calls, [('first', 'target'), ('second', 'target')])
+
+    def test_should_keep_single_and_compiled_actions(self):
+        action = lambda requestor: None
+        self.assertIs(compile_actions([action]), action)
+        compiled = compile_actions([action, action])
+        self.assertIs(compile_actions(compiled), compiled)
+        self.assertEqual(compile_events({TR.SHOT_AT: []}), {})
+
+    # =============================================================
+    # test broadcasting
+
+    def test_should_broadcast_to_subscribers_only(self):
+        dispatcher = TriggerDispatcher()
+        noop = lambda requestor: None
+        listener = FakeTarget({TR.SHOT_MISSED: [noop]})
+        other = FakeTarget({TR.SHOT_AT: [noop]})
+        dispatcher.subscribe(listener)
+        dispatcher.subscribe(other)
+        self.assertEqual(dispatcher.broadcast(TR.SHOT_MISSED), 1)
+        self.assertEqual(listener.fired, [TR.SHOT_MISSED])
+        self.assertEqual(other.fired, [])
+        self.assertEqual(dispatcher.broadcast(TR.LOST_HP), 0)
+
+    def test_should_skip_source_and_unsubscribed(self):
+        dispatcher = TriggerDispatcher()
+        noop = lambda requestor: None
+        source = FakeTarget({TR.SHOT_AT_ANOTHER: [noop]})
+        listener = FakeTarget({TR.SHOT_AT_ANOTHER: [noop]})
+        gone = FakeTarget({TR.SHOT_AT_ANOTHER: [noop]})
+        for target in (source, listener, gone):
+            dispatcher.subscribe(target)
+        dispatcher.unsubscribe(gone)
+        self.assertEqual(dispatcher.count(TR.SHOT_AT_ANOTHER), 2)
+        self.assertEqual(dispatcher.broadcast(TR.SHOT_AT_ANOTHER, source=source), 1)
+        self.assertEqual(source.fired, [])
+        self.assertEqual(gone.fired, [])
+
+    def test_should_allow_unsubscribing_during_broadcast(self):
+        dispatcher = TriggerDispatcher()
+        targets = []
+        leave = lambda requestor: dispatcher.unsubscribe(targets[1])
+        targets.append(FakeTarget({TR.LOST_HP: [leave]}))
+        targets.append(FakeTarget({TR.LOST_HP: [leave]}))
+        for target in targets:
+            dispatcher.subscribe(target)
+        self.assertEqual(dispatcher.broadcast(TR.LOST_HP), 2)
+        self.assertEqual(dispatcher.count(TR.LOST_HP), 1)
+
+# #############################################################
+# SUITES
+
+def suite_compiling():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTriggers('test_should_run_compiled_actions_in_order'))
+    suite.addTest(TestTriggers('test_should_keep_single_and_compiled_actions'))
+    return suite
+
+def suite_broadcasting():
+    suite = unittest.TestSuite()
+    suite.addTest(TestTriggers('test_should_broadcast_to_subscribers_only'))
+    suite.addTest(TestTriggers('test_should_skip_source_and_unsubscribed'))
+    suite.addTest(TestTriggers('test_should_allow_unsubscribing_during_broadcast'))
+    return suite
+
+# #############################################################
+# main
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite_compiling())
+    runner.run(suite_broadcasting())